@@ -3,17 +3,105 @@ This file contains all elements related to the HTN formalism use with python str
 """
 from __future__ import annotations
 
+import itertools
+import math
+import operator
+import sys
+import weakref
 from copy import deepcopy
-from dataclasses import dataclass, field
+from dataclasses import MISSING, dataclass, field, fields
 from typing import Any, Literal
 from uuid import uuid4
 
+__all__ = [
+    "HtnEntity",
+    "HtnType",
+    "HTN_TIMEPOINT",
+    "HTN_BOOLEAN",
+    "HTN_INTEGER",
+    "HtnTypedObject",
+    "HtnVariable",
+    "HtnConstant",
+    "HTN_TRUE",
+    "HTN_FALSE",
+    "HTN_TIME_SCALE",
+    "HTN_EPSILON",
+    "HtnTimepoint",
+    "HtnVariableTimepoint",
+    "HtnConstantTimepoint",
+    "HTN_ZERO",
+    "HtnTemporalInterval",
+    "HtnTemporalIntervalFactory",
+    "HtnSymbol",
+    "HtnStateVariableSymbol",
+    "HtnTaskSymbol",
+    "HtnPrimitiveTaskSymbol",
+    "HtnCompoundTaskSymbol",
+    "HtnMethodSymbol",
+    "HtnLabel",
+    "HtnParametricSymbol",
+    "HtnStateVariable",
+    "HtnCondition",
+    "HtnEffect",
+    "HtnEffectFactory",
+    "HtnConstraint",
+    "HtnTemporalConstraint",
+    "ConstraintArgumentError",
+    "HtnConstraintFactory",
+    "HtnTask",
+    "HtnPrimitiveTask",
+    "HtnCompoundTask",
+    "HtnLabelMappingPair",
+    "HtnTaskNetwork",
+    "HtnMethod",
+    "HtnLanguage",
+    "HtnDomain",
+    "HtnProblem",
+]
+
 
 class HtnEntity:
-    """Base class for the whole HTN formalism."""
+    """
+    Base class for the whole HTN formalism.
+
+    Immutable entities (`_HTN_IMMUTABLE`) are shared by `copy` and `deepcopy`
+    instead of being duplicated, since every object they reach is immutable too.
+    """
+
+    # The HTN entities are slotted dataclasses, so the base adds no `__dict__`.
+    # Zero-argument `super()` does not work in their methods, call the base directly.
+    __slots__ = ()
+
+    _HTN_IMMUTABLE = False
 
-    def __get_attributes(self) -> dict[str, Any]:
-        return deepcopy(self.__dict__)
+    def __copy__(self) -> HtnEntity:
+        if self._HTN_IMMUTABLE:
+            return self
+        return self.copy_with()
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> HtnEntity:
+        if self._HTN_IMMUTABLE:
+            return self
+        result = self.__class__(**self.__get_attributes(memo))
+        memo[id(self)] = result
+        return result
+
+    def __get_attributes(self, memo: dict[int, Any] | None = None) -> dict[str, Any]:
+        # Cached attributes (not given to `__init__`) are recomputed by the copy.
+        names = _INIT_FIELD_NAMES.get(self.__class__)
+        if names is None:
+            names = tuple(
+                attr.name for attr in fields(self) if attr.init  # type: ignore
+            )
+            _INIT_FIELD_NAMES[self.__class__] = names
+        if self._HTN_IMMUTABLE:
+            # Everything reachable from the entity is immutable, it can be shared.
+            return {name: getattr(self, name) for name in names}
+        # The copy must not share the containers (or the mutable entities)
+        # of the original, e.g. the sets of a domain.
+        if memo is None:
+            memo = {}
+        return {name: _htn_copy(getattr(self, name), memo) for name in names}
 
     def copy_with(self, **attrs_to_override) -> HtnEntity:
         """Return a copy of the object where the given attributes are overridden."""
@@ -25,48 +113,241 @@ class HtnEntity:
         """
         Return a copy of the object where the sequential attributes are extended,
         else there are overridden.
+
+        The extensions can be any iterable, e.g. a chain of several sequences,
+        so that each attribute is built only once.
         """
         attributes = self.__get_attributes()
         for attr_name, attr_value in attrs_to_extend.items():
             if attr_name in attributes:
                 current_attr_value = attributes[attr_name]
+                if (
+                    isinstance(current_attr_value, _HTN_EXTENDED_TYPES)
+                    and isinstance(attr_value, _HTN_SIZED_TYPES)
+                    and not attr_value
+                ):
+                    # Nothing to add.
+                    continue
                 if isinstance(current_attr_value, (set, dict)):
+                    # The container is already a copy of the original one.
                     current_attr_value.update(attr_value)
                     continue
+                if type(current_attr_value) is tuple:
+                    # Concatenating to an empty tuple reuses the extension.
+                    attributes[attr_name] = current_attr_value + tuple(attr_value)
+                    continue
                 if isinstance(current_attr_value, (tuple, list)):
-                    attributes[attr_name] = current_attr_value + attr_value
+                    attributes[attr_name] = type(current_attr_value)(
+                        itertools.chain(current_attr_value, attr_value)
+                    )
                     continue
             attributes[attr_name] = attr_value
         return self.__class__(**attributes)
 
 
-@dataclass(frozen=True)
-class HtnType(HtnEntity):
+# Names of the fields given to `__init__`, per entity class, used by the copies.
+# Copies still go through `__init__`, so that `__post_init__`, the interning and
+# the cached fields stay consistent.
+_INIT_FIELD_NAMES: dict[type, tuple[str, ...]] = {}
+
+# Attribute values extended by `copy_and_extend_with`.
+_HTN_EXTENDED_TYPES = (set, dict, tuple, list)
+# Extensions whose emptiness can be checked without consuming them.
+_HTN_SIZED_TYPES = (set, frozenset, dict, tuple, list)
+
+# Immutable attribute values which do not need any copy.
+_HTN_ATOMIC_TYPES = (type(None), bool, int, float, str)
+
+
+def _htn_copy(obj: Any, memo: dict[int, Any]) -> Any:
+    """
+    Deep copy specialised for the attributes of the HTN entities.
+
+    Entities are copied by their `__deepcopy__`, the builtin containers are rebuilt
+    around copied items, and anything else goes through `copy.deepcopy`.
+    """
+    if isinstance(obj, HtnEntity):
+        if obj._HTN_IMMUTABLE:  # pylint: disable=protected-access
+            return obj
+        if id(obj) in memo:
+            return memo[id(obj)]
+        return obj.__deepcopy__(memo)
+    obj_type = type(obj)
+    if obj_type in _HTN_ATOMIC_TYPES:
+        return obj
+    if obj_type is tuple:
+        # As `deepcopy`, keep the tuple when all its items are kept.
+        items = tuple(_htn_copy(item, memo) for item in obj)
+        if all(map(operator.is_, items, obj)):
+            return obj
+        return items
+    if obj_type in (set, frozenset, list):
+        return obj_type(_htn_copy(item, memo) for item in obj)
+    if obj_type is dict:
+        return {
+            _htn_copy(key, memo): _htn_copy(value, memo) for key, value in obj.items()
+        }
+    return deepcopy(obj, memo)
+
+
+# Getter of the compared fields of each class using `_cached_hash`.
+_HASHED_FIELDS: dict[type, operator.attrgetter] = {}
+
+
+def _cached_hash(entity: Any) -> int:
+    """
+    `__hash__` of the entities which keep their hash in a `_hash` field.
+
+    Hashes the compared fields, as the generated `__hash__` does, but only once.
+    """
+    result = entity._hash  # pylint: disable=protected-access
+    if result is None:
+        getter = _HASHED_FIELDS.get(entity.__class__)
+        if getter is None:
+            getter = operator.attrgetter(
+                *(attr.name for attr in fields(entity) if attr.compare)
+            )
+            _HASHED_FIELDS[entity.__class__] = getter
+        result = hash(getter(entity))
+        object.__setattr__(entity, "_hash", result)
+    return result
+
+
+class _InternedEntityType(type):
+    """
+    Metaclass of the interned entities.
+
+    Creating an entity whose class and attribute values match a living instance
+    returns that instance, so that equal entities share the same identity.
+    The instance is looked up from the arguments, before building a new entity.
+    """
+
+    _instances: weakref.WeakValueDictionary[
+        tuple[Any, ...], HtnEntity
+    ] = weakref.WeakValueDictionary()
+
+    def __call__(cls, *args, **kwargs):
+        if not cls._HTN_INTERNED:
+            return type.__call__(cls, *args, **kwargs)
+        if kwargs or len(args) != len(cls.__match_args__):
+            bound_args = _bind_interned_args(cls, args, kwargs)
+            if bound_args is None:
+                # Let `__init__` report the invalid arguments.
+                return type.__call__(cls, *args, **kwargs)
+            args = bound_args
+        key = cls._intern_key(args)
+        instances = _InternedEntityType._instances
+        entity = instances.get(key)
+        if entity is None:
+            entity = instances[key] = type.__call__(cls, *args)
+        return entity
+
+
+# Number of required arguments and default values of each interned class,
+# in the order of `__match_args__`.
+_INTERNED_DEFAULTS: dict[type, tuple[int, tuple[Any, ...]]] = {}
+
+
+def _bind_interned_args(
+    cls: type, args: tuple[Any, ...], kwargs: dict[str, Any]
+) -> tuple[Any, ...] | None:
+    """
+    Returns
+    -------
+    tuple | None
+        The arguments of `cls` in the order of `__match_args__`, with their defaults,
+        or None if they do not match its fields.
+    """
+    signature = _INTERNED_DEFAULTS.get(cls)
+    if signature is None:
+        defaults = tuple(
+            cls.__dataclass_fields__[name].default  # type: ignore
+            for name in cls.__match_args__  # type: ignore
+        )
+        required = 0
+        while required < len(defaults) and defaults[required] is MISSING:
+            required += 1
+        signature = _INTERNED_DEFAULTS[cls] = (required, defaults)
+    required, defaults = signature
+    if len(args) > len(defaults):
+        return None
+    if not kwargs:
+        if len(args) < required:
+            return None
+        return args + defaults[len(args) :]
+    kwargs = dict(kwargs)
+    bound_args = args + tuple(
+        kwargs.pop(name, default)
+        for name, default in zip(
+            cls.__match_args__[len(args) :], defaults[len(args) :]  # type: ignore
+        )
+    )
+    if kwargs or any(arg is MISSING for arg in bound_args[:required]):
+        return None
+    return bound_args
+
+
+class _HtnInternedEntity(HtnEntity, metaclass=_InternedEntityType):
+    """
+    Base class of the interned entities, see `_InternedEntityType`.
+
+    They can be compared by identity, e.g. `tpe is HTN_BOOLEAN`.
+    """
+
+    __slots__ = ()
+
+    # Whether the entities of the class are interned.
+    _HTN_INTERNED = True
+
+    @classmethod
+    def _intern_key(cls, args: tuple[Any, ...]) -> tuple[Any, ...]:
+        """Returns the interning key of the entity of `cls` built from `args`."""
+        # The value types are part of the key, so that e.g. `1` and `True`
+        # do not resolve to the same entity.
+        return (cls, *args, *map(type, args))
+
+    def __reduce__(self):
+        # Unpickle through the constructor, so that the result is interned too.
+        return (
+            self.__class__,
+            tuple(getattr(self, name) for name in self.__match_args__),
+        )
+
+
+@dataclass(frozen=True, slots=True, weakref_slot=True)
+class HtnType(_HtnInternedEntity):
     """
     Represents the type of a variable or a constant.
     e.g., `location - object`
     """
 
+    _HTN_IMMUTABLE = True
+
     name: str
     parent: HtnType | None = None
+    _hash: int | None = field(default=None, init=False, repr=False, compare=False)
+
+    __hash__ = _cached_hash
+
+    def __post_init__(self):
+        object.__setattr__(self, "name", sys.intern(self.name))
 
     def __str__(self) -> str:
         return self.name
 
-    def __eq__(self, __o: object) -> bool:
-        if not isinstance(__o, HtnType):
-            return False
-        if self.name != __o.name:
-            return False
-        return self.parent == __o.parent
-
 
 HTN_TIMEPOINT = HtnType("__timepoint__")
 HTN_BOOLEAN = HtnType("__boolean__")
 HTN_INTEGER = HtnType("__integer__")
 
+# Kinds of typed objects, combined as bit flags in `HtnTypedObject._KIND`.
+# Checking them is cheaper than `isinstance` on the hot paths.
+_KIND_VARIABLE = 1
+_KIND_CONSTANT = 2
+_KIND_TIMEPOINT = 4
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class HtnTypedObject(HtnEntity):
     """
     Represents an object of the planning problem with a `HtnType`.
@@ -74,63 +355,66 @@ class HtnTypedObject(HtnEntity):
     It is an abstract class, it must **not be instantiated**.
     """
 
+    _HTN_IMMUTABLE = True
+    _KIND = 0
+
     value: str | int | bool
     tpe: HtnType
+    # Lazily computed by `__str__`.
+    _str: str | None = field(default=None, init=False, repr=False, compare=False)
+    _hash: int | None = field(default=None, init=False, repr=False, compare=False)
+
+    __hash__ = _cached_hash
 
     @property
     def is_constant(self) -> bool:
         """Whether or not this object is a constant."""
-        return isinstance(self, HtnConstant)
+        return bool(self._KIND & _KIND_CONSTANT)
 
     @property
     def is_timepoint(self) -> bool:
         """Whether or not this object is a timepoint."""
-        return isinstance(self, HtnTimepoint)
+        return bool(self._KIND & _KIND_TIMEPOINT)
 
     @property
     def is_variable(self) -> bool:
         """Whether or not this object is a variable."""
-        return isinstance(self, HtnVariable)
+        return bool(self._KIND & _KIND_VARIABLE)
 
     def __str__(self) -> str:
-        if self in (HTN_TRUE, HTN_FALSE):
+        if self._str is None:
+            object.__setattr__(self, "_str", self._format())
+        return self._str  # type: ignore
+
+    def _format(self) -> str:
+        """Return the str format, cached by `__str__`."""
+        if self is HTN_TRUE or self is HTN_FALSE:
             return f"{self.value}"
         return f"{self.value} - {self.tpe}"
 
-    def __eq__(self, __o: object) -> bool:
-        if not isinstance(__o, HtnTypedObject):
-            return False
-        if __o.value != self.value:
-            return False
-        if __o.tpe != self.tpe:
-            return False
-        return True
-
 
-@dataclass(frozen=True)
-class HtnVariable(HtnTypedObject):
+@dataclass(frozen=True, slots=True, weakref_slot=True)
+class HtnVariable(HtnTypedObject, _HtnInternedEntity):
     """
     Represents a variable of the planning problem.
     e.g. `?l - location`
     """
 
-    value: str
+    _KIND = _KIND_VARIABLE
+    __hash__ = _cached_hash
 
-    def __eq__(self, __o: object) -> bool:
-        """Necessary to call HtnTypedObject eq method"""
-        return super().__eq__(__o)
+    value: str
 
 
-@dataclass(frozen=True)
-class HtnConstant(HtnTypedObject):
+@dataclass(frozen=True, slots=True, weakref_slot=True)
+class HtnConstant(HtnTypedObject, _HtnInternedEntity):
     """
     Represents a constant of the planning problem.
     e.g. `L0 - location`
     """
 
-    def __eq__(self, __o: object) -> bool:
-        """Necessary to call HtnTypedObject eq method"""
-        return super().__eq__(__o)
+    _KIND = _KIND_CONSTANT
+    __hash__ = _cached_hash
 
 
 HTN_TRUE = HtnConstant(True, HTN_BOOLEAN)
@@ -143,7 +427,29 @@ HTN_TIME_SCALE = 10
 HTN_EPSILON = 1 / HTN_TIME_SCALE
 
 
-@dataclass(frozen=True)
+def _scale_delay(delay: float) -> int:
+    """
+    Returns
+    -------
+    int
+        The delay counted in 1 / HTN_TIME_SCALE units.
+
+    Raises
+    ------
+    ValueError
+        If the delay is not a multiple of `HTN_EPSILON`, it would be lost.
+    """
+    exact_delay = delay * HTN_TIME_SCALE
+    scaled_delay = round(exact_delay)
+    # Only absorbs the float errors, e.g. of `0.1 + 0.2`.
+    if not math.isclose(exact_delay, scaled_delay, abs_tol=1e-6):
+        raise ValueError(
+            f"Expected a HtnTimepoint delay multiple of {HTN_EPSILON} but got {delay}."
+        )
+    return scaled_delay
+
+
+@dataclass(frozen=True, slots=True)
 class HtnTimepoint(HtnTypedObject):
     """
     Represents a timepoint of the planning problem.
@@ -151,50 +457,78 @@ class HtnTimepoint(HtnTypedObject):
     It is an abstract class, it must **not be instantiated**.
     """
 
+    _KIND = _KIND_TIMEPOINT
+    __hash__ = _cached_hash
+    # Timepoints are mostly short-lived results of `+`: interning them costs
+    # more than it saves.
+    _HTN_INTERNED = False
+
     value: str | int
     tpe: HtnType = HTN_TIMEPOINT
-    delay: float = 0
+    delay: float = field(default=0, compare=False)
+    # The delay counted in 1 / HTN_TIME_SCALE units, as done by chronicles.
+    # The arithmetic and comparisons are done on it, so they stay exact.
+    scaled_delay: int = field(default=0, init=False, repr=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "scaled_delay", _scale_delay(self.delay))
 
     def __add__(self, other: Any) -> HtnTimepoint:
         try:
             other = float(other)
-            return self.__class__(
-                delay=self.delay + other, value=self.value, tpe=self.tpe
-            )
         except (TypeError, ValueError) as err:
             raise err.__class__(
                 f"Expected a number to be added to a HtnTimepoint but got {other}."
             ) from err
+        scaled_other = _scale_delay(other)
+        if scaled_other == 0:
+            # Timepoints are immutable, no need for an equal copy.
+            return self
+        return self._with_scaled_delay(self.scaled_delay + scaled_other)
+
+    def _with_scaled_delay(self, scaled_delay: int) -> HtnTimepoint:
+        """
+        Returns
+        -------
+        HtnTimepoint
+            A copy of the timepoint with the delay `scaled_delay / HTN_TIME_SCALE`.
+        """
+        # The delay is already at the time resolution: the fields are set directly
+        # rather than going through `__init__` and `__post_init__`.
+        timepoint = object.__new__(self.__class__)
+        object.__setattr__(timepoint, "value", self.value)
+        object.__setattr__(timepoint, "tpe", self.tpe)
+        object.__setattr__(timepoint, "_str", None)
+        object.__setattr__(timepoint, "_hash", None)
+        object.__setattr__(timepoint, "delay", scaled_delay / HTN_TIME_SCALE)
+        object.__setattr__(timepoint, "scaled_delay", scaled_delay)
+        return timepoint
 
     def __sub__(self, other: Any) -> HtnTimepoint:
         return self + (-other)
 
-    def __str__(self) -> str:
-        if self.delay == 0:
+    def _format(self) -> str:
+        if self.scaled_delay == 0:
             return f"{self.value}"
         if isinstance(self.value, int):
             return f"{self.value + self.delay}"
         return f"{self.value} + {self.delay}"
 
-    def __eq__(self, __o: object) -> bool:
-        if not super().__eq__(__o):
-            return False
-        if not isinstance(__o, HtnTimepoint):
-            return False
-        return __o.delay == self.delay
-
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class HtnVariableTimepoint(HtnTimepoint, HtnVariable):
     """
     Represents a variable timepoint.
     e.g. `?t_s`
     """
 
+    _KIND = _KIND_VARIABLE | _KIND_TIMEPOINT
+    __hash__ = _cached_hash
+
     value: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class HtnConstantTimepoint(HtnTimepoint, HtnConstant):
     """
     Represents a constant timepoint.
@@ -202,6 +536,9 @@ class HtnConstantTimepoint(HtnTimepoint, HtnConstant):
     e.g. `5`
     """
 
+    _KIND = _KIND_CONSTANT | _KIND_TIMEPOINT
+    __hash__ = _cached_hash
+
     value: int
 
 
@@ -209,23 +546,34 @@ class HtnConstantTimepoint(HtnTimepoint, HtnConstant):
 HTN_ZERO = HtnConstantTimepoint(0)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class HtnTemporalInterval(HtnEntity):
     """
     Represents a temporal interval.
     e.g. `[2, 5]`
     """
 
+    _HTN_IMMUTABLE = True
+
     start: HtnTimepoint
     end: HtnTimepoint
+    # Text prefix of the intervals built by `HtnTemporalIntervalFactory`.
+    _tag: str | None = field(default=None, init=False, repr=False, compare=False)
 
     def __add__(self, other) -> HtnTemporalInterval:
-        return HtnTemporalInterval(self.start + other, self.end + other)
+        return self._with_tag(HtnTemporalInterval(self.start + other, self.end + other))
 
     def __sub__(self, other) -> HtnTemporalInterval:
-        return HtnTemporalInterval(self.start - other, self.end - other)
+        return self._with_tag(HtnTemporalInterval(self.start - other, self.end - other))
+
+    def _with_tag(self, interval: HtnTemporalInterval) -> HtnTemporalInterval:
+        """Give the tag of this interval to the other one and return it."""
+        object.__setattr__(interval, "_tag", self._tag)
+        return interval
 
     def __str__(self) -> str:
+        if self._tag is not None:
+            return self._tag
         default = f"[{self.start}, {self.end}] "
         if isinstance(self.start.value, int) or isinstance(self.end.value, int):
             return default
@@ -239,13 +587,6 @@ class HtnTemporalInterval(HtnEntity):
             return "over-all "
         return default
 
-    def __eq__(self, __o: object) -> bool:
-        if not isinstance(__o, HtnTemporalInterval):
-            return False
-        if __o.start != self.start:
-            return False
-        return __o.end == self.end
-
 
 class HtnTemporalIntervalFactory:
     """
@@ -255,17 +596,56 @@ class HtnTemporalIntervalFactory:
 
     counter = 0
 
+    # Start id, end id and text tag of each kind of interval.
+    _KINDS = {
+        "default": ("d", "d", ""),
+        "at_start": ("s", "s", "at-start "),
+        "at_end": ("e", "e", "at-end "),
+        "over_all": ("s", "e", "over-all "),
+    }
+
     @classmethod
-    def _make(cls, start_id: str, end_id: str):
+    def _make(cls, start_id: str, end_id: str, tag: str):
         """
         Creates and returns a temporal interval.
         Generic function for all other methods.
         """
         start = f"__{start_id}__{cls.counter}"
-        cls.counter += 1
-        end = f"__{end_id}__{cls.counter}"
-        cls.counter += 1
-        return HtnTemporalInterval(HtnTimepoint(start), HtnTimepoint(end))
+        end = f"__{end_id}__{cls.counter + 1}"
+        cls.counter += 2
+        return cls._build(start, end, tag)
+
+    @classmethod
+    def _build(cls, start: str, end: str, tag: str) -> HtnTemporalInterval:
+        """Creates and returns a tagged temporal interval."""
+        interval = HtnTemporalInterval(HtnTimepoint(start), HtnTimepoint(end))
+        object.__setattr__(interval, "_tag", tag)
+        return interval
+
+    @classmethod
+    def many(
+        cls,
+        kind: Literal["default", "at_start", "at_end", "over_all"],
+        n: int,
+    ) -> tuple[HtnTemporalInterval, ...]:
+        """
+        Creates and returns `n` distinct temporal intervals of the given kind.
+        The identifiers are reserved at once instead of one interval at a time.
+
+        Raises
+        ------
+        ValueError
+            If `n` is negative, the identifiers would be reused.
+        """
+        if n < 0:
+            raise ValueError(f"Expected a number of intervals >= 0 but got {n}.")
+        start_id, end_id, tag = cls._KINDS[kind]
+        ids = range(cls.counter, cls.counter + 2 * n)
+        cls.counter += 2 * n
+        return tuple(
+            cls._build(f"__{start_id}__{start}", f"__{end_id}__{end}", tag)
+            for start, end in zip(ids[::2], ids[1::2])
+        )
 
     @classmethod
     def default(cls) -> HtnTemporalInterval:
@@ -273,58 +653,64 @@ class HtnTemporalIntervalFactory:
         Creates and returns a default temporal interval.
         Typically used for sequential problems.
         """
-        return cls._make("d", "d")
+        return cls._make(*cls._KINDS["default"])
 
     @classmethod
     def at_start(cls) -> HtnTemporalInterval:
         """
         Creates and returns the temporal interval equivalent to 'at-start' in PDDL.
         """
-        return cls._make("s", "s")
+        return cls._make(*cls._KINDS["at_start"])
 
     @classmethod
     def at_end(cls) -> HtnTemporalInterval:
         """
         Creates and returns the temporal interval equivalent to 'at-end' in PDDL.
         """
-        return cls._make("e", "e")
+        return cls._make(*cls._KINDS["at_end"])
 
     @classmethod
     def over_all(cls) -> HtnTemporalInterval:
         """
         Creates and returns the temporal interval equivalent to 'over-all' in PDDL.
         """
-        return cls._make("s", "e")
+        return cls._make(*cls._KINDS["over_all"])
 
 
-@dataclass(frozen=True)
-class HtnSymbol(HtnEntity):
+@dataclass(frozen=True, slots=True, weakref_slot=True)
+class HtnSymbol(_HtnInternedEntity):
     """
     Represents a symbol of the planning problem.
 
     It is an abstract class, it must **not be instantiated**.
     """
 
+    _HTN_IMMUTABLE = True
+
     name: str
+    _hash: int | None = field(default=None, init=False, repr=False, compare=False)
+
+    __hash__ = _cached_hash
 
-    def __eq__(self, __o: object) -> bool:
-        if not isinstance(__o, HtnSymbol):
-            return False
-        return self.name == __o.name
+    def __post_init__(self):
+        # Names are passed over and over to chronicles, share a single string.
+        object.__setattr__(self, "name", sys.intern(self.name))
 
     def __str__(self) -> str:
         return self.name
 
 
-@dataclass(frozen=True, eq=False)
+@dataclass(frozen=True, slots=True)
 class HtnStateVariableSymbol(HtnSymbol):
     """
     Represents the symbol of a state variable.
     e.g. `loc`
     """
 
+    __hash__ = _cached_hash
 
-@dataclass(frozen=True, eq=False)
+
+@dataclass(frozen=True, slots=True)
 class HtnTaskSymbol(HtnSymbol):
     """
     Represents the symbol of a primitive or a compound task.
@@ -332,54 +718,93 @@ class HtnTaskSymbol(HtnSymbol):
     It is an abstract class, it must **not be instantiated**.
     """
 
+    __hash__ = _cached_hash
+
 
-@dataclass(frozen=True, eq=False)
+@dataclass(frozen=True, slots=True)
 class HtnPrimitiveTaskSymbol(HtnTaskSymbol):
     """
     Represents the symbol of a primitive task.
     e.g. `pick`
     """
 
+    __hash__ = _cached_hash
+
 
-@dataclass(frozen=True, eq=False)
+@dataclass(frozen=True, slots=True)
 class HtnCompoundTaskSymbol(HtnTaskSymbol):
     """
     Represents the symbol of a compound task.
     e.g. `transfer`
     """
 
+    __hash__ = _cached_hash
 
-@dataclass(frozen=True, eq=False)
+
+@dataclass(frozen=True, slots=True)
 class HtnMethodSymbol(HtnSymbol):
     """
     Represents the symbol of a method.
     """
 
+    __hash__ = _cached_hash
+
 
-@dataclass(frozen=True)
-class HtnLabel(HtnEntity):
+@dataclass(frozen=True, slots=True, weakref_slot=True)
+class HtnLabel(_HtnInternedEntity):
     """
     Represents a label of the HTN language.
     e.g. `l_1`
     """
 
+    _HTN_IMMUTABLE = True
+
     value: str
+    _hash: int | None = field(default=None, init=False, repr=False, compare=False)
+
+    __hash__ = _cached_hash
+
+    def __post_init__(self):
+        object.__setattr__(self, "value", sys.intern(self.value))
 
     def __str__(self) -> str:
         return self.value
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class HtnParametricSymbol(HtnEntity):
     """
     Represents a symbols associated with parameters.
     e.g. a state variable or a task.
     """
 
+    _HTN_IMMUTABLE = True
+
     symbol: HtnSymbol
     params: tuple[HtnTypedObject, ...]
+    # Lazily computed, see the properties of the same name.
+    _constants: tuple[HtnConstant, ...] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _variables: tuple[HtnVariable, ...] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _timepoints: tuple[HtnTimepoint, ...] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # Lazily computed by `__str__`.
+    _str: str | None = field(default=None, init=False, repr=False, compare=False)
+    _hash: int | None = field(default=None, init=False, repr=False, compare=False)
+
+    __hash__ = _cached_hash
 
     def __str__(self) -> str:
+        if self._str is None:
+            object.__setattr__(self, "_str", self._format())
+        return self._str  # type: ignore
+
+    def _format(self) -> str:
+        """Return the str format, cached by `__str__`."""
         return f"{self.symbol}({', '.join(map(str,self.params))})"
 
     @property
@@ -390,38 +815,42 @@ class HtnParametricSymbol(HtnEntity):
     @property
     def constants(self) -> tuple[HtnConstant, ...]:
         """Return only the constant parameters."""
-        return tuple(param for param in self.params if isinstance(param, HtnConstant))
+        if self._constants is None:
+            self.__split_params()
+        return self._constants  # type: ignore
 
     @property
     def variables(self) -> tuple[HtnVariable, ...]:
         """Return only the variable parameters."""
-        return tuple(param for param in self.params if isinstance(param, HtnVariable))
+        if self._variables is None:
+            self.__split_params()
+        return self._variables  # type: ignore
 
     @property
     def timepoints(self) -> tuple[HtnTimepoint, ...]:
         """Return only the timepoint parameters."""
-        return tuple(param for param in self.params if isinstance(param, HtnTimepoint))
-
-    def __eq__(self, __o) -> bool:
-        if not isinstance(__o, HtnParametricSymbol):
-            return False
-        if self.symbol != __o.symbol:
-            return False
-        if len(self.params) != len(__o.params):
-            return False
-        for param in self.params:
-            match: bool = False
-            for __o_param in __o.params:
-                if param == __o_param:
-                    match = True
-                    break
-            if not match:
-                return False
-        return True
-
+        if self._timepoints is None:
+            self.__split_params()
+        return self._timepoints  # type: ignore
 
-@dataclass(frozen=True)
-class HtnStateVariable(HtnParametricSymbol):
+    def __split_params(self) -> None:
+        """Sort the parameters by kind in a single pass."""
+        constants, variables, timepoints = [], [], []
+        for param in self.params:
+            kind = param._KIND  # pylint: disable=protected-access
+            if kind & _KIND_CONSTANT:
+                constants.append(param)
+            if kind & _KIND_VARIABLE:
+                variables.append(param)
+            if kind & _KIND_TIMEPOINT:
+                timepoints.append(param)
+        object.__setattr__(self, "_constants", tuple(constants))
+        object.__setattr__(self, "_variables", tuple(variables))
+        object.__setattr__(self, "_timepoints", tuple(timepoints))
+
+
+@dataclass(frozen=True, slots=True, weakref_slot=True)
+class HtnStateVariable(HtnParametricSymbol, _HtnInternedEntity):
     """
     Represents a state variable of the planning problem.
     e.g. `loc(?r)`
@@ -430,39 +859,62 @@ class HtnStateVariable(HtnParametricSymbol):
     symbol: HtnStateVariableSymbol
     tpe: HtnType = HTN_BOOLEAN
 
+    __hash__ = _cached_hash
+
+    @classmethod
+    def _intern_key(cls, args: tuple[Any, ...]) -> tuple[Any, ...]:
+        symbol, params, tpe = args
+        # The parameters are keyed by identity, as they are equal when their
+        # values are, e.g. the constants `1` and `True`.
+        return (cls, symbol, tpe, *map(id, params))
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class HtnCondition(HtnEntity):
     """
     Represents a condition on a state variable over a temporal interval.
     e.g. `[0,5] loc(?r) = L_0`
     """
 
+    _HTN_IMMUTABLE = True
+
     sv: HtnStateVariable
     value: HtnTypedObject = HTN_TRUE
     interval: HtnTemporalInterval = field(
         default_factory=HtnTemporalIntervalFactory.default
     )
+    # Lazily computed by `__str__`.
+    _str: str | None = field(default=None, init=False, repr=False, compare=False)
 
     def __str__(self) -> str:
-        return f"{self.interval}{self.sv} = {self.value}"
+        if self._str is None:
+            object.__setattr__(self, "_str", f"{self.interval}{self.sv} = {self.value}")
+        return self._str  # type: ignore
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class HtnEffect(HtnEntity):
     """
     Represents an effect on a state variable over a temporal interval.
     e.g. `[0,5] loc(?r) <-- L_1`
     """
 
+    _HTN_IMMUTABLE = True
+
     sv: HtnStateVariable
     value: HtnTypedObject
     interval: HtnTemporalInterval = field(
         default_factory=HtnTemporalIntervalFactory.default
     )
+    # Lazily computed by `__str__`.
+    _str: str | None = field(default=None, init=False, repr=False, compare=False)
 
     def __str__(self) -> str:
-        return f"{self.interval}{self.sv} <-- {self.value}"
+        if self._str is None:
+            object.__setattr__(
+                self, "_str", f"{self.interval}{self.sv} <-- {self.value}"
+            )
+        return self._str  # type: ignore
 
 
 class HtnEffectFactory:
@@ -509,11 +961,11 @@ class HtnEffectFactory:
 
         /!\\ **Predicates** only.
         """
-        if sv.tpe != HTN_BOOLEAN:
+        if sv.tpe is not HTN_BOOLEAN:
             raise TypeError(
                 f"Dirac are allowed for predicates only. Received a {sv.tpe}"
             )
-        opposition_value = HTN_TRUE if value == HTN_FALSE else HTN_FALSE
+        opposition_value = HTN_TRUE if value is HTN_FALSE else HTN_FALSE
         return (
             HtnEffect(
                 sv=sv,
@@ -528,22 +980,32 @@ class HtnEffectFactory:
         )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class HtnConstraint(HtnEntity):
     """
     Represents a constraint between two typed objects.
     e.g. `?l_s != ?l_e`
     """
 
+    _HTN_IMMUTABLE = True
+
     left: HtnTypedObject
     right: HtnTypedObject
     relation: Literal["==", "!=", "<", "<=", ">", ">="]
+    # Lazily computed by `__str__`.
+    _str: str | None = field(default=None, init=False, repr=False, compare=False)
 
     def __str__(self) -> str:
+        if self._str is None:
+            object.__setattr__(self, "_str", self._format())
+        return self._str  # type: ignore
+
+    def _format(self) -> str:
+        """Return the str format, cached by `__str__`."""
         return f"{self.left.value} {self.relation} {self.right.value}"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class HtnTemporalConstraint(HtnConstraint):
     """
     Represents a temporal constraint between two timepoints.
@@ -555,7 +1017,7 @@ class HtnTemporalConstraint(HtnConstraint):
     left_label: HtnLabel | None = None
     right_label: HtnLabel | None = None
 
-    def __str__(self) -> str:
+    def _format(self) -> str:
         left = (
             f"{self.left_label}_" if self.left_label is not None else ""
         ) + f"{self.left}"
@@ -588,12 +1050,14 @@ class HtnConstraintFactory:
         lab_left: HtnLabel | None = None,
         lab_right: HtnLabel | None = None,
     ) -> HtnConstraint | HtnTemporalConstraint:
-        """Create a constraint."""
-        if isinstance(left, HtnTimepoint):
-            if not isinstance(right, HtnTimepoint):
+        """Create a constraint, checking that its arguments are consistent."""
+        if left.is_timepoint:
+            if not right.is_timepoint:
                 raise ConstraintArgumentError("left is a timepoint but right is not.")
-            return HtnTemporalConstraint(left, right, relation, lab_left, lab_right)
-        if isinstance(right, HtnTimepoint):
+            return cls._make_temporal(
+                left, right, relation, lab_left, lab_right  # type: ignore
+            )
+        if right.is_timepoint:
             raise ConstraintArgumentError("right is a timepoint but left is not.")
         if lab_left is not None:
             raise ConstraintArgumentError(
@@ -603,6 +1067,28 @@ class HtnConstraintFactory:
             raise ConstraintArgumentError(
                 "lab_right is not necessary for a no-temporal constraint."
             )
+        return cls._make_nontemporal(left, right, relation)
+
+    @classmethod
+    def _make_temporal(
+        cls,
+        left: HtnTimepoint,
+        right: HtnTimepoint,
+        relation: Literal["==", "!=", "<", "<=", ">", ">="],
+        lab_left: HtnLabel | None = None,
+        lab_right: HtnLabel | None = None,
+    ) -> HtnTemporalConstraint:
+        """Create a temporal constraint, without checking the arguments."""
+        return HtnTemporalConstraint(left, right, relation, lab_left, lab_right)
+
+    @classmethod
+    def _make_nontemporal(
+        cls,
+        left: HtnTypedObject,
+        right: HtnTypedObject,
+        relation: Literal["==", "!=", "<", "<=", ">", ">="],
+    ) -> HtnConstraint:
+        """Create a no-temporal constraint, without checking the arguments."""
         return HtnConstraint(left, right, relation)
 
     @classmethod
@@ -613,9 +1099,10 @@ class HtnConstraintFactory:
         label: HtnLabel | None = None,
     ) -> HtnTemporalConstraint:
         """Create a temporal constraint specifying the duration for a task."""
-        return cls.eq(  # type: ignore
+        return cls._make_temporal(
             task_or_interval.end,
             task_or_interval.start + duration,
+            "==",
             label,
             label,
         )
@@ -641,9 +1128,10 @@ class HtnConstraintFactory:
         label: HtnLabel | None = None,
     ) -> HtnTemporalConstraint:
         """Create a temporal constraint specifying a minimal duration for a task."""
-        return cls.ge(  # type: ignore
+        return cls._make_temporal(
             task_or_interval.end,
             task_or_interval.start + duration,
+            ">=",
             label,
             label,
         )
@@ -730,7 +1218,7 @@ class HtnConstraintFactory:
         return cls._make(left, right, "<=", lab_left, lab_right)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class HtnTask(HtnParametricSymbol):
     """
     Represents a primitive or a compound task of the planning problem.
@@ -741,6 +1229,8 @@ class HtnTask(HtnParametricSymbol):
         default_factory=HtnTemporalIntervalFactory.default
     )
 
+    __hash__ = _cached_hash
+
     @property
     def start(self) -> HtnTimepoint:
         """
@@ -761,22 +1251,11 @@ class HtnTask(HtnParametricSymbol):
         """
         return self.interval.end
 
-    def __str__(self) -> str:
-        return f"{self.interval}{super().__str__()}"
+    def _format(self) -> str:
+        return f"{self.interval}{HtnParametricSymbol._format(self)}"
 
-    def __eq__(self, __o: object) -> bool:
-        if not super().__eq__(__o):
-            return False
-        if not isinstance(__o, HtnTask):
-            return False
-        if self.symbol != __o.symbol:
-            return False
-        if self.interval != __o.interval:
-            return False
-        return True
 
-
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True, weakref_slot=True)
 class HtnPrimitiveTask(HtnTask):
     """
     Represents a primitive task of the planning problem.
@@ -787,41 +1266,47 @@ class HtnPrimitiveTask(HtnTask):
     constraints: tuple[HtnConstraint, ...] = ()
     conditions: tuple[HtnCondition, ...] = ()
     effects: tuple[HtnEffect, ...] = ()
+    # Lazily computed, see the properties of the same name.
+    _all_params: tuple[HtnTypedObject, ...] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _state_variables: frozenset[HtnStateVariable] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    __hash__ = _cached_hash
 
     @property
     def all_params(self) -> tuple[HtnTypedObject, ...]:
-        all_params = list(self.params)
-        sv_params = [param for sv in self.state_variables for param in sv.params]
-        for param in sv_params:
-            if param not in all_params:
-                all_params.append(param)
-        return tuple(all_params)
+        result = self._all_params
+        if result is None:
+            # An insertion-ordered dict removes the duplicates in linear time.
+            all_params = dict.fromkeys(self.params)
+            all_params.update(
+                dict.fromkeys(
+                    param for sv in self.state_variables for param in sv.params
+                )
+            )
+            result = tuple(all_params)
+            object.__setattr__(self, "_all_params", result)
+        return result
 
     @property
-    def state_variables(self) -> set[HtnStateVariable]:
+    def state_variables(self) -> frozenset[HtnStateVariable]:
         """
         Returns
         -------
-        set[HtnStateVariable]
+        frozenset[HtnStateVariable]
             All the state variables which are present in this primitive task.
         """
-        return {cont.sv for cont in self.conditions + self.effects}
-
-    def __eq__(self, __o: object) -> bool:
-        if not super().__eq__(__o):
-            return False
-        if not isinstance(__o, HtnPrimitiveTask):
-            return False
-        if self.constraints != __o.constraints:
-            return False
-        if self.conditions != __o.conditions:
-            return False
-        if self.effects != __o.effects:
-            return False
-        return True
-
-
-@dataclass(frozen=True)
+        result = self._state_variables
+        if result is None:
+            result = frozenset(cont.sv for cont in self.conditions + self.effects)
+            object.__setattr__(self, "_state_variables", result)
+        return result
+
+
+@dataclass(frozen=True, slots=True)
 class HtnCompoundTask(HtnTask):
     """
     Represents a compound task of the planning problem.
@@ -830,18 +1315,15 @@ class HtnCompoundTask(HtnTask):
 
     symbol: HtnCompoundTaskSymbol
 
-    def __eq__(self, __o) -> bool:
-        if not super().__eq__(__o):
-            return False
-        if not isinstance(__o, HtnCompoundTask):
-            return False
-        return True
+    __hash__ = _cached_hash
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class HtnLabelMappingPair(HtnEntity):
     """Pair of a HTN label and a HTN task."""
 
+    _HTN_IMMUTABLE = True
+
     label: HtnLabel
     task: HtnTask
 
@@ -853,14 +1335,23 @@ class HtnLabelMappingPair(HtnEntity):
             )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class HtnTaskNetwork(HtnEntity):
     """
     Represents a task network of the planning problem.
     """
 
+    _HTN_IMMUTABLE = True
+
     label_mapping: tuple[HtnLabelMappingPair, ...] = ()
     constraints: tuple[HtnTemporalConstraint, ...] = ()
+    # Computed by `__post_init__`, see `tasks` and `labels`.
+    _tasks: tuple[HtnTask, ...] = field(
+        default=(), init=False, repr=False, compare=False
+    )
+    _labels: tuple[HtnLabel, ...] = field(
+        default=(), init=False, repr=False, compare=False
+    )
 
     @property
     def tasks(self) -> tuple[HtnTask, ...]:
@@ -870,8 +1361,17 @@ class HtnTaskNetwork(HtnEntity):
         tuple[HtnTask, ...]
             The set of tasks contained by `label_mapping`.
         """
-        result = [mapping.task for mapping in self.label_mapping]
-        return tuple(result)
+        return self._tasks
+
+    @property
+    def labels(self) -> tuple[HtnLabel, ...]:
+        """
+        Returns
+        -------
+        tuple[HtnLabel, ...]
+            The labels contained by `label_mapping`, in the order of `tasks`.
+        """
+        return self._labels
 
     def __str__(self) -> str:
         return f"{', '.join(map(str, self.tasks))}"
@@ -883,43 +1383,78 @@ class HtnTaskNetwork(HtnEntity):
                 raise TypeError(
                     f"'label_mapping' has to contain only HtnLabelMappingPair instances, received a {type(lmp)}."  # noqa: E501
                 )
+        object.__setattr__(
+            self, "_tasks", tuple(lmp.task for lmp in self.label_mapping)
+        )
+        object.__setattr__(
+            self, "_labels", tuple(lmp.label for lmp in self.label_mapping)
+        )
+
+
+# Identifiers of the anonymous methods, unique within the process.
+_METHOD_IDS = itertools.count()
 
 
 # Cannot inherits from `HtnParametricSymbol` because we don't want to
 # define the parameters during the initialisation.
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True, weakref_slot=True)
 class HtnMethod(HtnEntity):
     """
     Represents a method for the decomposition of a compound task.
     e.g. `transfer ==> {go, pick, go, drop}`
     """
 
+    _HTN_IMMUTABLE = True
+
     task: HtnCompoundTask
     task_network: HtnTaskNetwork
     constraints: tuple[HtnConstraint, ...] = ()
     conditions: tuple[HtnCondition, ...] = ()
     symbol: HtnMethodSymbol = field(
-        default_factory=lambda: HtnMethodSymbol(f"method_{uuid4()}")
+        default_factory=lambda: HtnMethodSymbol(f"method_{next(_METHOD_IDS)}")
+    )
+    # Lazily computed, see the properties of the same name.
+    _all_params: tuple[HtnTypedObject, ...] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _params: tuple[HtnTypedObject, ...] | None = field(
+        default=None, init=False, repr=False, compare=False
     )
+    _state_variables: frozenset[HtnStateVariable] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _hash: int | None = field(default=None, init=False, repr=False, compare=False)
+
+    __hash__ = _cached_hash
 
     @property
     def all_params(self) -> tuple[HtnTypedObject, ...]:
         """Return all parameters, even the hidden ones."""
-        all_params = set(self.task.all_params)
-        for task in self.task_network.tasks:
-            all_params.update(task.all_params)
-        all_params.update(param for sv in self.state_variables for param in sv.params)
-        return tuple(all_params)
+        result = self._all_params
+        if result is None:
+            all_params = set(self.task.all_params)
+            for task in self.task_network.tasks:
+                all_params.update(task.all_params)
+            all_params.update(
+                param for sv in self.state_variables for param in sv.params
+            )
+            result = tuple(all_params)
+            object.__setattr__(self, "_all_params", result)
+        return result
 
     @property
-    def state_variables(self) -> set[HtnStateVariable]:
+    def state_variables(self) -> frozenset[HtnStateVariable]:
         """
         Returns
         -------
-        set[HtnStateVariable]
+        frozenset[HtnStateVariable]
             All the state variables which are present in this method.
         """
-        return {cont.sv for cont in self.conditions}
+        result = self._state_variables
+        if result is None:
+            result = frozenset(cont.sv for cont in self.conditions)
+            object.__setattr__(self, "_state_variables", result)
+        return result
 
     @property
     def interval(self) -> HtnTemporalInterval:
@@ -940,10 +1475,14 @@ class HtnMethod(HtnEntity):
             The concatenation of params contained in the task
             and the subtasks of the task network.
         """
-        result = set(self.task.params)
-        for task in self.task_network.tasks:
-            result.update(task.params)
-        return tuple(result)
+        result = self._params
+        if result is None:
+            params = set(self.task.params)
+            for task in self.task_network.tasks:
+                params.update(task.params)
+            result = tuple(params)
+            object.__setattr__(self, "_params", result)
+        return result
 
     def __str__(self) -> str:
         return f"{self.interval}{self.symbol}({', '.join(map(str,self.params))})"
@@ -959,7 +1498,7 @@ class HtnMethod(HtnEntity):
             )
 
 
-@dataclass
+@dataclass(slots=True)
 class HtnLanguage(HtnEntity):
     """
     Represents the language of the planning problem.
@@ -999,10 +1538,10 @@ Labs: \n\t{nl_tab.join(map(str, self.Labs))}
 
     def add_typed_object(self, typed_object: HtnTypedObject):
         """Add task elements to this language"""
-        if isinstance(typed_object, HtnConstant):
-            return self.Csts.add(typed_object)
-        elif isinstance(typed_object, HtnVariable):
-            return self.Vars.add(typed_object)
+        if typed_object.is_constant:
+            return self.Csts.add(typed_object)  # type: ignore
+        elif typed_object.is_variable:
+            return self.Vars.add(typed_object)  # type: ignore
         else:
             raise TypeError(
                 f"Cannot add typed object to language. Received a {typed_object.tpe}"
@@ -1020,15 +1559,32 @@ Labs: \n\t{nl_tab.join(map(str, self.Labs))}
 
     def add_method(self, method: HtnMethod):
         """Add method elements to this language"""
-        self.add_task(method.task)
-        # conditions
-        self.StVars.update(sv.symbol for sv in method.state_variables)
-        for lmp in method.task_network.label_mapping:
-            self.Labs.add(lmp.label)
-            self.add_task(lmp.task)
+        tasks = (method.task, *method.task_network.tasks)
+        prims = [task for task in tasks if isinstance(task, HtnPrimitiveTask)]
+        self.Vars.update(
+            itertools.chain.from_iterable(task.variables for task in tasks)
+        )
+        self.Csts.update(
+            itertools.chain.from_iterable(task.constants for task in tasks)
+        )
+        self.Prims.update(prim.symbol for prim in prims)
+        self.Comps.update(
+            task.symbol  # type: ignore
+            for task in tasks
+            if not isinstance(task, HtnPrimitiveTask)
+        )
+        # conditions of the method and of its primitive subtasks
+        self.StVars.update(
+            sv.symbol
+            for sv in itertools.chain(
+                method.state_variables,
+                itertools.chain.from_iterable(prim.state_variables for prim in prims),
+            )
+        )
+        self.Labs.update(method.task_network.labels)
 
 
-@dataclass
+@dataclass(slots=True)
 class HtnDomain(HtnEntity):
     """
     Represents the domain of the planning problem.
@@ -1041,21 +1597,35 @@ class HtnDomain(HtnEntity):
     Tc: set[HtnCompoundTask] = field(default_factory=set)
     M: set[HtnMethod] = field(default_factory=set)
     name: str = field(default_factory=lambda: f"domain_{uuid4()}")
+    # (Tp, M, state variables) snapshot, checked against the public sets since
+    # they can also be modified directly.
+    _sv_cache: (
+        tuple[
+            frozenset[HtnPrimitiveTask],
+            frozenset[HtnMethod],
+            frozenset[HtnStateVariable],
+        ]
+        | None
+    ) = field(default=None, init=False, repr=False, compare=False)
 
     @property
-    def state_variables(self) -> set[HtnStateVariable]:
+    def state_variables(self) -> frozenset[HtnStateVariable]:
         """
         Returns
         -------
-        set[HtnStateVariable]
+        frozenset[HtnStateVariable]
             All the state variables which are present in this domain.
         """
-        result = set()
-        for prim in self.Tp:
-            result.update(prim.state_variables)
-        for method in self.M:
-            result.update(method.state_variables)
-        return result
+        cache = self._sv_cache
+        if cache is None or cache[0] != self.Tp or cache[1] != self.M:
+            state_variables = set()
+            for prim in self.Tp:
+                state_variables.update(prim.state_variables)
+            for method in self.M:
+                state_variables.update(method.state_variables)
+            cache = (frozenset(self.Tp), frozenset(self.M), frozenset(state_variables))
+            self._sv_cache = cache
+        return cache[2]
 
     def merge(self, domain: HtnDomain) -> None:
         """
@@ -1089,11 +1659,11 @@ name: \n\t{self.name}
         """Add task (and its elements) to this domain"""
         self.L.add_method(method)
         self.M.add(method)
-        for lmp in method.task_network.label_mapping:
-            self.add_task(lmp.task)
+        for task in method.task_network.tasks:
+            self.add_task(task)
 
 
-@dataclass
+@dataclass(slots=True)
 class HtnProblem(HtnEntity):
     """
     Represents the planning problem.
@@ -1105,6 +1675,8 @@ class HtnProblem(HtnEntity):
     s_I: set[HtnEffect] = field(default_factory=set)
     tn_I: HtnTaskNetwork | None = None
     name: str = field(default_factory=lambda: f"problem_{uuid4()}")
+    # Whether the problem is known to have no solution, e.g. in tests.
+    expected_failure: bool = False
 
     @property
     def state_variables(self) -> set[HtnStateVariable]:
@@ -1114,7 +1686,7 @@ class HtnProblem(HtnEntity):
         set[HtnStateVariable]
             All the state variables which are present in this problem.
         """
-        result = self.D.state_variables
+        result = set(self.D.state_variables)
         result.update([effect.sv for effect in self.s_I])
         return result
 
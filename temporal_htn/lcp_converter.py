@@ -1,14 +1,16 @@
 from __future__ import annotations
 
+import functools
 import os
+import weakref
 from enum import Enum, auto
+from typing import Any, Iterable
 
 # pylint: disable=no-name-in-module
 from .chronicles import ChronicleProblem as LcpChronicleProblem
 from .htn import (
     HTN_BOOLEAN,
     HTN_INTEGER,
-    HTN_TIME_SCALE,
     HtnCompoundTask,
     HtnCondition,
     HtnConstant,
@@ -40,13 +42,7 @@ def get_constraint(htn_constraint: HtnConstraint) -> list[str]:
     list[str]
         A list usable by chronicles, representing the HTN constraint.
     """
-    if isinstance(htn_constraint, HtnTemporalConstraint):
-        return get_temporal_constraint(htn_constraint)
-    return [
-        get_typed_object(htn_constraint.left),
-        htn_constraint.relation,
-        get_typed_object(htn_constraint.right),
-    ]
+    return list(_get_constraint(htn_constraint))
 
 
 def get_temporal_constraint(htn_constraint: HtnTemporalConstraint):
@@ -56,11 +52,7 @@ def get_temporal_constraint(htn_constraint: HtnTemporalConstraint):
     list[str]
         A list usable by chronicles, representing the HTN temporal constraint.
     """
-    return [
-        get_timepoint(htn_constraint.left, htn_constraint.left_label),
-        htn_constraint.relation,
-        get_timepoint(htn_constraint.right, htn_constraint.right_label),
-    ]
+    return list(_get_temporal_constraint(htn_constraint))
 
 
 def get_interval(
@@ -80,10 +72,7 @@ def get_interval(
     list[str]
         A list usable by chronicles, representing the HTN temporal interval.
     """
-    return [
-        get_timepoint(htn_interval.start, htn_label),
-        get_timepoint(htn_interval.end, htn_label),
-    ]
+    return list(_get_interval(htn_interval, htn_label))
 
 
 def get_timepoint(htn_timepoint: HtnTimepoint, htn_label: HtnLabel = None) -> str:
@@ -101,12 +90,10 @@ def get_timepoint(htn_timepoint: HtnTimepoint, htn_label: HtnLabel = None) -> st
     str
         A string usable by chronicles, representing the HTN timepoint.
     """
-    value = f"{htn_timepoint.value}"
-    if htn_label:
-        value += f"{htn_label}"
-    return (
-        f"{value} + {int(htn_timepoint.delay * HTN_TIME_SCALE)} - {htn_timepoint.tpe}"
-    )
+    delay, tpe = htn_timepoint.scaled_delay, htn_timepoint.tpe
+    if htn_label is None:
+        return f"{htn_timepoint.value} + {delay} - {tpe}"
+    return f"{htn_timepoint.value}{htn_label} + {delay} - {tpe}"
 
 
 def get_typed_object(htn_obj: HtnTypedObject) -> str:
@@ -121,6 +108,87 @@ def get_typed_object(htn_obj: HtnTypedObject) -> str:
     return f"{htn_obj.value} - {htn_obj.tpe}"
 
 
+# The conversions below are pure functions of immutable HTN entities, which
+# recur across many signatures: they return immutable tuples, cached by each
+# `ChroniclesProblem` for its own conversion only.
+# The public functions above copy them into the lists expected by chronicles.
+
+
+def _get_constraint(htn_constraint: HtnConstraint) -> tuple[str, ...]:
+    if isinstance(htn_constraint, HtnTemporalConstraint):
+        return _get_temporal_constraint(htn_constraint)
+    return (
+        get_typed_object(htn_constraint.left),
+        htn_constraint.relation,
+        get_typed_object(htn_constraint.right),
+    )
+
+
+def _get_temporal_constraint(
+    htn_constraint: HtnTemporalConstraint,
+) -> tuple[str, ...]:
+    return (
+        get_timepoint(htn_constraint.left, htn_constraint.left_label),
+        htn_constraint.relation,
+        get_timepoint(htn_constraint.right, htn_constraint.right_label),
+    )
+
+
+def _get_interval(
+    htn_interval: HtnTemporalInterval, htn_label: HtnLabel = None
+) -> tuple[str, str]:
+    return (
+        get_timepoint(htn_interval.start, htn_label),
+        get_timepoint(htn_interval.end, htn_label),
+    )
+
+
+def _get_signature(
+    htn_param_sym: HtnParametricSymbol | HtnMethod,
+) -> tuple[str, ...]:
+    return (
+        htn_param_sym.symbol.name,
+        *map(get_typed_object, htn_param_sym.all_params),
+    )
+
+
+# Arguments of the native `add_action` and `add_method` for each converted action
+# and method, with the symbols they refer to, shared by all the problems
+# converting the same domain.
+_PAYLOADS: weakref.WeakKeyDictionary[
+    HtnPrimitiveTask | HtnMethod, tuple[tuple[Any, ...], frozenset[HtnSymbol]]
+] = weakref.WeakKeyDictionary()
+
+
+def _get_symbols(htn_entity: HtnPrimitiveTask | HtnMethod) -> frozenset[HtnSymbol]:
+    """
+    Returns
+    -------
+    frozenset[HtnSymbol]
+        The symbols referred to by the converted action or method.
+    """
+    symbols = {htn_entity.symbol}
+    symbols.update(sv.symbol for sv in htn_entity.state_variables)
+    if isinstance(htn_entity, HtnMethod):
+        symbols.add(htn_entity.task.symbol)
+        symbols.update(task.symbol for task in htn_entity.task_network.tasks)
+    return frozenset(symbols)
+
+
+def _add_new(container: set, item: Any) -> bool:
+    """
+    Adds `item` to `container`, hashing it only once.
+
+    Returns
+    -------
+    bool
+        Whether `item` was not already in `container`.
+    """
+    size = len(container)
+    container.add(item)
+    return len(container) != size
+
+
 class ChroniclesProblem:
     """
     Converter from temporal HTN formalism to Chronicles.
@@ -130,6 +198,19 @@ class ChroniclesProblem:
         self.name = name
         self.plan_file = f"output/{self.name}.plan"
         self.problem = LcpChronicleProblem()
+        # Cached for this problem only, so that the converted entities are not
+        # kept alive once the problem is dropped.
+        self._get_constraint = functools.lru_cache(maxsize=None)(_get_constraint)
+        self._get_interval = functools.lru_cache(maxsize=None)(_get_interval)
+        self._get_signature = functools.lru_cache(maxsize=None)(_get_signature)
+        # Native methods registering the symbols which do not need a type.
+        self._add_native_symbol = {
+            ChronicleSymbolType.ACTION: self.problem.add_action_symbol,
+            ChronicleSymbolType.METHOD: self.problem.add_method_symbol,
+            ChronicleSymbolType.PREDICATE: self.problem.add_predicate_symbol,
+            ChronicleSymbolType.FUNCTION: self.problem.add_function_symbol,
+            ChronicleSymbolType.TASK: self.problem.add_task_symbol,
+        }
 
         self.context_created: bool = False
         self.symbol_table_created: bool = False
@@ -157,29 +238,42 @@ class ChroniclesProblem:
         The symbol table has to be created.
         The context has to be created.
         """
-        if htn_action in self.actions:
-            return
         self.check_symbol(htn_action.symbol)
         self.check_context()
-        self.actions.add(htn_action)
+        if not _add_new(self.actions, htn_action):
+            return
 
+        entry = _PAYLOADS.get(htn_action)
+        if entry is None:
+            entry = _PAYLOADS[htn_action] = (
+                self._convert_action(htn_action),
+                _get_symbols(htn_action),
+            )
+        else:
+            # The conversion checks the symbols, a reused one has to check them too.
+            self.check_symbols(entry[1])
+        self.problem.add_action(*entry[0])
+
+    def _convert_action(self, htn_action: HtnPrimitiveTask) -> tuple[Any, ...]:
+        """
+        Returns
+        -------
+        tuple
+            The arguments of the native `add_action` for the action.
+        """
         signature = self.get_signature_temporal(htn_action)
-        constraints = [
-            get_constraint(constraint) for constraint in htn_action.constraints
-        ]
-        conditions = [
-            self.get_condition(condition) for condition in htn_action.conditions
-        ]
-        effects = [self.get_effect(effect) for effect in htn_action.effects]
+        constraints = self._get_constraints(htn_action.constraints)
+        conditions = list(map(self.get_condition, htn_action.conditions))
+        effects = list(map(self.get_effect, htn_action.effects))
 
         # Add a min duration if the action has at least one effect.
         # If the action has a duration of zero then the effect will be instantaneous,
         # which is not desirable.
         if len(effects) > 0:
             constraint = HtnConstraintFactory.min_duration_eps(htn_action)
-            constraints.append(get_constraint(constraint))
+            constraints.append(list(self._get_constraint(constraint)))
 
-        self.problem.add_action(signature, constraints, conditions, effects)
+        return signature, constraints, conditions, effects
 
     def add_constant(self, htn_constant: HtnConstant) -> None:
         """
@@ -188,9 +282,8 @@ class ChroniclesProblem:
 
         Adds the type and the symbol of the constant.
         """
-        if htn_constant in self.constants:
+        if not _add_new(self.constants, htn_constant):
             return
-        self.constants.add(htn_constant)
 
         self.add_type(htn_constant.tpe)
         self.add_symbol(
@@ -213,32 +306,40 @@ class ChroniclesProblem:
         The symbol table has to be created.
         The context has to be created.
         """
-        if htn_method in self.methods:
-            return
         self.check_symbol(htn_method.symbol)
         self.check_context()
-        self.methods.add(htn_method)
+        if not _add_new(self.methods, htn_method):
+            return
 
+        entry = _PAYLOADS.get(htn_method)
+        if entry is None:
+            entry = _PAYLOADS[htn_method] = (
+                self._convert_method(htn_method),
+                _get_symbols(htn_method),
+            )
+        else:
+            # The conversion checks the symbols, a reused one has to check them too.
+            self.check_symbols(entry[1])
+        self.problem.add_method(*entry[0])
+
+    def _convert_method(self, htn_method: HtnMethod) -> tuple[Any, ...]:
+        """
+        Returns
+        -------
+        tuple
+            The arguments of the native `add_method` for the method.
+        """
         signature = self.get_signature_temporal(htn_method)
-        constraints = [
-            get_constraint(constraint) for constraint in htn_method.constraints
-        ]
-        conditions = [
-            self.get_condition(condition) for condition in htn_method.conditions
-        ]
+        constraints = self._get_constraints(htn_method.constraints)
+        conditions = list(map(self.get_condition, htn_method.conditions))
         task = self.get_signature(htn_method.task)
-        subtasks = [
-            self.get_signature_temporal(lmp.task, lmp.label)
-            for lmp in htn_method.task_network.label_mapping
-        ]
-        subtasks_constraints = [
-            get_constraint(constraint)
-            for constraint in htn_method.task_network.constraints
-        ]
-
-        self.problem.add_method(
-            signature, constraints, conditions, task, subtasks, subtasks_constraints
+        task_network = htn_method.task_network
+        subtasks = list(
+            map(self.get_signature_temporal, task_network.tasks, task_network.labels)
         )
+        subtasks_constraints = self._get_constraints(task_network.constraints)
+
+        return signature, constraints, conditions, task, subtasks, subtasks_constraints
 
     def add_initial_effect(self, htn_effect: HtnEffect) -> None:
         """
@@ -252,11 +353,10 @@ class ChroniclesProblem:
         The symbol table has to be created.
         The context has to be created.
         """
-        if htn_effect in self.initial_effects:
-            return
         self.check_symbol(htn_effect.sv.symbol)
         self.check_context()
-        self.initial_effects.add(htn_effect)
+        if not _add_new(self.initial_effects, htn_effect):
+            return
 
         self.problem.add_initial_effect(self.get_effect(htn_effect))
 
@@ -276,16 +376,43 @@ class ChroniclesProblem:
         NotImplementedError
             If the type of the state variable is not handled by the solver.
         """
-        if htn_sv in self.state_variables:
-            return
         self.check_symbol(htn_sv.symbol)
-        self.state_variables.add(htn_sv)
+        self._add_state_variable(htn_sv)
+
+    def add_state_variables(self, htn_svs: Iterable[HtnStateVariable]) -> None:
+        """
+        Adds new state variables to the problem.
+        Skips the state variables already in `self.state_variables`.
+
+        The symbol table is checked once for the whole batch.
+
+        /!\\\
+        The symbols of the state variables have to be already registered.
+        The symbol table has to be created.
+
+        Raises
+        ------
+        UnregisteredSymbolError
+            If the symbol of a state variable has not been added.
+        NotImplementedError
+            If the type of a state variable is not handled by the solver.
+        """
+        self.check_symbol_table()
+        symbols = self.symbols
+        for htn_sv in htn_svs:
+            if htn_sv.symbol not in symbols:
+                raise UnregisteredSymbolError(htn_sv.symbol)
+            self._add_state_variable(htn_sv)
+
+    def _add_state_variable(self, htn_sv: HtnStateVariable) -> None:
+        if not _add_new(self.state_variables, htn_sv):
+            return
 
-        signature = self.get_signature(htn_sv)
+        signature = list(self._get_signature(htn_sv))
 
-        if htn_sv.tpe == HTN_BOOLEAN:
+        if htn_sv.tpe is HTN_BOOLEAN:
             self.problem.add_predicate(signature)
-        elif htn_sv.tpe == HTN_INTEGER:
+        elif htn_sv.tpe is HTN_INTEGER:
             self.problem.add_function(signature)
         else:
             raise NotImplementedError(
@@ -318,45 +445,66 @@ class ChroniclesProblem:
         RuntimeError
             If `symbol_type` is not handled.
         """
-        if symbol in self.symbols:
+        if not _add_new(self.symbols, symbol):
             return
-        self.symbols.add(symbol)
 
-        if symbol_type == ChronicleSymbolType.ACTION:
-            self.problem.add_action_symbol(symbol.name)
-        elif symbol_type == ChronicleSymbolType.CONSTANT:
+        if symbol_type is ChronicleSymbolType.CONSTANT:
             if htn_type is None:
                 raise ValueError(
                     "`htn_type` cannot be null for adding a constant symbol."
                 )
             self.problem.add_constant_symbol(symbol.name, htn_type.name)
-        elif symbol_type == ChronicleSymbolType.METHOD:
-            self.problem.add_method_symbol(symbol.name)
-        elif symbol_type == ChronicleSymbolType.PREDICATE:
-            self.problem.add_predicate_symbol(symbol.name)
-        elif symbol_type == ChronicleSymbolType.FUNCTION:
-            self.problem.add_function_symbol(symbol.name)
-        elif symbol_type == ChronicleSymbolType.TASK:
-            self.problem.add_task_symbol(symbol.name)
-        else:
+            return
+        add_native_symbol = self._add_native_symbol.get(symbol_type)
+        if add_native_symbol is None:
+            raise RuntimeError("The given symbol type is not handled.")
+        add_native_symbol(symbol.name)
+
+    def add_symbols(
+        self,
+        symbols: Iterable[HtnSymbol],
+        symbol_type: ChronicleSymbolType,
+    ) -> None:
+        """
+        Adds new symbols of the same type to the problem.
+        Skips the symbols already in `self.symbols`.
+
+        The chronicles binding has no batch entry point, so the native method
+        is looked up once for the whole batch, then called for each new symbol.
+
+        Raises
+        ------
+        ValueError
+            If try to add `CONSTANT` symbols, since they need a type each.
+        RuntimeError
+            If `symbol_type` is not handled.
+        """
+        if symbol_type is ChronicleSymbolType.CONSTANT:
+            raise ValueError("Constant symbols have to be added with `add_symbol`.")
+        add_native_symbol = self._add_native_symbol.get(symbol_type)
+        if add_native_symbol is None:
             raise RuntimeError("The given symbol type is not handled.")
+        for symbol in symbols:
+            if _add_new(self.symbols, symbol):
+                add_native_symbol(symbol.name)
 
     def add_type(self, htn_type: HtnType) -> None:
         """
         Adds a new type to the problem.
         Does nothing if the type is in `self.types`.
 
-        It calls itself recursively to create the whole
-        hierarchy until the root is reached.
+        It also adds the unregistered ancestors of the type,
+        from the root of the hierarchy down to the type.
         """
-        if htn_type in self.types:
-            return
-        self.types.add(htn_type)
-
-        parent = htn_type.parent.name if htn_type.parent else None
-        self.problem.add_type(htn_type.name, parent)
-        if htn_type.parent is not None:
-            self.add_type(htn_type.parent)
+        new_types: list[HtnType] = []
+        current: HtnType | None = htn_type
+        while current is not None and current not in self.types:
+            new_types.append(current)
+            current = current.parent
+        for new_type in reversed(new_types):
+            self.types.add(new_type)
+            parent = new_type.parent.name if new_type.parent else None
+            self.problem.add_type(new_type.name, parent)
 
     def add_variable(self, htn_variable: HtnVariable) -> None:
         """
@@ -365,9 +513,8 @@ class ChroniclesProblem:
 
         Adds the type of the variable.
         """
-        if htn_variable in self.variables:
+        if not _add_new(self.variables, htn_variable):
             return
-        self.variables.add(htn_variable)
 
         self.add_type(htn_variable.tpe)
 
@@ -388,10 +535,23 @@ class ChroniclesProblem:
         UnregisteredSymbolError
             If `symbol` has not been added.
         """
-        self.check_symbol_table()
+        if not self.symbol_table_created:
+            raise UncreatedSymbolTableError()
         if symbol not in self.symbols:
             raise UnregisteredSymbolError(symbol)
 
+    def check_symbols(self, symbols: frozenset[HtnSymbol]) -> None:
+        """
+        Raises
+        ------
+        UnregisteredSymbolError
+            If one of `symbols` has not been added.
+        """
+        if not self.symbol_table_created:
+            raise UncreatedSymbolTableError()
+        if not symbols <= self.symbols:
+            raise UnregisteredSymbolError(min(symbols - self.symbols, key=str))
+
     def check_symbol_table(self) -> None:
         """
         Raises
@@ -429,11 +589,18 @@ class ChroniclesProblem:
         list[str]
             A list usable by chronicles, representing the HTN condition.
         """
-        return (
-            self.get_signature(htn_condition.sv)
-            + [str(htn_condition.value.value)]
-            + get_interval(htn_condition.interval)
-        )
+        return self._get_assignment(htn_condition)
+
+    def _get_constraints(
+        self, htn_constraints: Iterable[HtnConstraint]
+    ) -> list[list[str]]:
+        """
+        Returns
+        -------
+        list[list[str]]
+            The lists usable by chronicles, representing the HTN constraints.
+        """
+        return list(map(list, map(self._get_constraint, htn_constraints)))
 
     def get_effect(self, htn_effect: HtnEffect) -> list[str]:
         """
@@ -442,11 +609,19 @@ class ChroniclesProblem:
         list[str]
             A list usable by chronicles, representing the HTN effect.
         """
-        return (
-            self.get_signature(htn_effect.sv)
-            + [str(htn_effect.value.value)]
-            + get_interval(htn_effect.interval)
-        )
+        return self._get_assignment(htn_effect)
+
+    def _get_assignment(self, htn_assignment: HtnCondition | HtnEffect) -> list[str]:
+        """
+        Conditions and effects share the same format:
+        the signature of the state variable, its value, then the interval.
+        """
+        self.check_symbol(htn_assignment.sv.symbol)
+        return [
+            *self._get_signature(htn_assignment.sv),
+            str(htn_assignment.value.value),
+            *self._get_interval(htn_assignment.interval),
+        ]
 
     def get_signature(
         self,
@@ -460,10 +635,7 @@ class ChroniclesProblem:
             It is its symbol followed by the parameter values.
         """
         self.check_symbol(htn_param_sym.symbol)
-        self.check_symbol_table()
-        return [htn_param_sym.symbol.name] + [
-            get_typed_object(param) for param in htn_param_sym.all_params
-        ]
+        return list(self._get_signature(htn_param_sym))
 
     def get_signature_temporal(
         self, htn_obj: HtnTask | HtnMethod, htn_label: HtnLabel = None
@@ -476,7 +648,11 @@ class ChroniclesProblem:
             It is its symbol followed by the parameter values
             followed by the temporal interval.
         """
-        return self.get_signature(htn_obj) + get_interval(htn_obj.interval, htn_label)
+        self.check_symbol(htn_obj.symbol)
+        return [
+            *self._get_signature(htn_obj),
+            *self._get_interval(htn_obj.interval, htn_label),
+        ]
 
     @classmethod
     def from_htn(  # noqa: C901  # pylint: disable=too-many-branches
@@ -492,45 +668,50 @@ class ChroniclesProblem:
         """
         # Init
         problem = ChroniclesProblem(name=htn_problem.name)
-        # Map state variable symbols to the state variable type.
-        sv_map = {sv.symbol: sv.tpe for sv in htn_problem.state_variables}
+        # Walk each collection of the problem once, in a deterministic order.
+        state_variables = sorted(htn_problem.state_variables, key=str)
+        actions = sorted(htn_problem.D.Tp, key=str)
+        methods = sorted(htn_problem.D.M, key=str)
         # Types & Symbols
         for constant in htn_problem.D.L.Csts:
             problem.add_constant(constant)
         for variable in htn_problem.D.L.Vars:
             problem.add_variable(variable)
-        # Note: Use intersection because a state variable can be defined
-        # in the language without being used by the problem.
-        # Therefore, it is not registered.
-        for sv_sym in htn_problem.D.L.StVars.intersection(
-            sv.symbol for sv in htn_problem.state_variables
-        ):
-            if sv_map[sv_sym] == HTN_BOOLEAN:
-                problem.add_symbol(sv_sym, ChronicleSymbolType.PREDICATE)
-            elif sv_map[sv_sym] == HTN_INTEGER:
-                problem.add_symbol(sv_sym, ChronicleSymbolType.FUNCTION)
+        # Note: Only keep the symbols of the language which are used
+        # by a state variable of the problem, the others are not registered.
+        # `add_symbols` skips the symbols shared by several state variables.
+        stvars = htn_problem.D.L.StVars
+        predicate_syms = []
+        function_syms = []
+        for sv in state_variables:
+            if sv.symbol not in stvars:
+                continue
+            if sv.tpe is HTN_BOOLEAN:
+                predicate_syms.append(sv.symbol)
+            elif sv.tpe is HTN_INTEGER:
+                function_syms.append(sv.symbol)
             else:
                 raise NotImplementedError(
-                    f"The solver can only handle booleans and integers state variables, got {sv_map[sv_sym]}"  # noqa: E501
+                    f"The solver can only handle booleans and integers state variables, got {sv.tpe}"  # noqa: E501
                 )
-        for action_sym in htn_problem.D.L.Prims:
-            problem.add_symbol(action_sym, ChronicleSymbolType.ACTION)
-        for task_sym in htn_problem.D.L.Comps:
-            problem.add_symbol(task_sym, ChronicleSymbolType.TASK)
-        for method in htn_problem.D.M:
-            problem.add_symbol(method.symbol, ChronicleSymbolType.METHOD)
+        problem.add_symbols(predicate_syms, ChronicleSymbolType.PREDICATE)
+        problem.add_symbols(function_syms, ChronicleSymbolType.FUNCTION)
+        problem.add_symbols(htn_problem.D.L.Prims, ChronicleSymbolType.ACTION)
+        problem.add_symbols(htn_problem.D.L.Comps, ChronicleSymbolType.TASK)
+        problem.add_symbols(
+            (method.symbol for method in methods), ChronicleSymbolType.METHOD
+        )
         # Symbol table
         problem.create_symbol_table()
         # State Variables
-        for sv in htn_problem.state_variables:
-            problem.add_state_variable(sv)
+        problem.add_state_variables(state_variables)
         # Context
         problem.create_context()
         # Actions
-        for action in htn_problem.D.Tp:
+        for action in actions:
             problem.add_action(action)
         # Methods
-        for method in htn_problem.D.M:
+        for method in methods:
             problem.add_method(method)
         # Goal
         problem.set_goal(htn_problem.tn_I)
@@ -556,13 +737,14 @@ class ChroniclesProblem:
         self.check_symbol_table()
         self.check_context()
 
-        tasks = [
-            self.get_signature_temporal(lmp.task, lmp.label)
-            for lmp in htn_task_network.label_mapping
-        ]
-        constraints = [
-            get_constraint(constraint) for constraint in htn_task_network.constraints
-        ]
+        tasks = list(
+            map(
+                self.get_signature_temporal,
+                htn_task_network.tasks,
+                htn_task_network.labels,
+            )
+        )
+        constraints = self._get_constraints(htn_task_network.constraints)
 
         self.problem.add_goal(tasks, constraints)
 
@@ -1,3 +1,4 @@
+from copy import deepcopy
 from unittest import TestCase
 
 from temporal_htn import (
@@ -36,365 +37,370 @@ class AbstractTest(TestCase):
 
     # pylint: disable=too-many-instance-attributes,too-many-statements
 
-    def setUp(self) -> None:
+    @classmethod
+    def setUpClass(cls) -> None:
         """
         Creates a delivering HTN problem with a durative action.
+
+        The entities are created once and shared by all the tests of the class.
+        The mutable ones are copied for each test by `setUp`.
         """
-        super().setUp()
+        super().setUpClass()
 
         # Types
-        self.t_location = HtnType("location")
-        self.t_locatable = HtnType("locatable")
-        self.t_package = HtnType("package", self.t_locatable)
-        self.t_robot = HtnType("robot", self.t_locatable)
+        cls.t_location = HtnType("location")
+        cls.t_locatable = HtnType("locatable")
+        cls.t_package = HtnType("package", cls.t_locatable)
+        cls.t_robot = HtnType("robot", cls.t_locatable)
 
         # Variables
-        self.v_from = HtnVariable("?from", self.t_location)
-        self.v_to = HtnVariable("?to", self.t_location)
-        self.v_location = HtnVariable("?loc", self.t_location)
-        self.v_locatable = HtnVariable("?obj", self.t_locatable)
-        self.v_robot = HtnVariable("?r", self.t_robot)
-        self.v_package = HtnVariable("?p", self.t_package)
-        self.v_time_start = HtnVariableTimepoint("?ts")
-        self.v_time_end = HtnVariableTimepoint("?te")
+        cls.v_from = HtnVariable("?from", cls.t_location)
+        cls.v_to = HtnVariable("?to", cls.t_location)
+        cls.v_location = HtnVariable("?loc", cls.t_location)
+        cls.v_locatable = HtnVariable("?obj", cls.t_locatable)
+        cls.v_robot = HtnVariable("?r", cls.t_robot)
+        cls.v_package = HtnVariable("?p", cls.t_package)
+        cls.v_time_start = HtnVariableTimepoint("?ts")
+        cls.v_time_end = HtnVariableTimepoint("?te")
 
         # Objects
-        self.o_loc0 = HtnConstant("L0", self.t_location)
-        self.o_loc1 = HtnConstant("L1", self.t_location)
-        self.o_loc2 = HtnConstant("L2", self.t_location)
-        self.o_robot = HtnConstant("R", self.t_robot)
-        self.o_package = HtnConstant("P", self.t_package)
+        cls.o_loc0 = HtnConstant("L0", cls.t_location)
+        cls.o_loc1 = HtnConstant("L1", cls.t_location)
+        cls.o_loc2 = HtnConstant("L2", cls.t_location)
+        cls.o_robot = HtnConstant("R", cls.t_robot)
+        cls.o_package = HtnConstant("P", cls.t_package)
 
         # Symbols
-        self.s_sv_at = HtnStateVariableSymbol("at")
-        self.s_sv_holding = HtnStateVariableSymbol("holding")
-        self.s_sv_empty = HtnStateVariableSymbol("empty")
-        self.s_sv_path = HtnStateVariableSymbol("path")
+        cls.s_sv_at = HtnStateVariableSymbol("at")
+        cls.s_sv_holding = HtnStateVariableSymbol("holding")
+        cls.s_sv_empty = HtnStateVariableSymbol("empty")
+        cls.s_sv_path = HtnStateVariableSymbol("path")
 
-        self.s_p_move = HtnPrimitiveTaskSymbol("move")
-        self.s_p_pick = HtnPrimitiveTaskSymbol("pick-up")
-        self.s_p_drop = HtnPrimitiveTaskSymbol("drop")
-        self.s_p_speak = HtnPrimitiveTaskSymbol("speak")
+        cls.s_p_move = HtnPrimitiveTaskSymbol("move")
+        cls.s_p_pick = HtnPrimitiveTaskSymbol("pick-up")
+        cls.s_p_drop = HtnPrimitiveTaskSymbol("drop")
+        cls.s_p_speak = HtnPrimitiveTaskSymbol("speak")
 
-        self.s_c_go = HtnCompoundTaskSymbol("go")
-        self.s_c_transfer = HtnCompoundTaskSymbol("transfer")
+        cls.s_c_go = HtnCompoundTaskSymbol("go")
+        cls.s_c_transfer = HtnCompoundTaskSymbol("transfer")
 
-        self.s_m_go = HtnMethodSymbol("m-go")
-        self.s_m_already_there = HtnMethodSymbol("m-already-there")
-        self.s_m_transfer = HtnMethodSymbol("m-tranfer")
-        self.s_m_already_transferred = HtnMethodSymbol("m-already-transferred")
+        cls.s_m_go = HtnMethodSymbol("m-go")
+        cls.s_m_already_there = HtnMethodSymbol("m-already-there")
+        cls.s_m_transfer = HtnMethodSymbol("m-tranfer")
+        cls.s_m_already_transferred = HtnMethodSymbol("m-already-transferred")
 
-        self.l_0 = HtnLabel("l0")
-        self.l_1 = HtnLabel("l1")
-        self.l_2 = HtnLabel("l2")
-        self.l_3 = HtnLabel("l3")
-        self.l_4 = HtnLabel("l4")
-        self.l_5 = HtnLabel("l5")
+        cls.l_0 = HtnLabel("l0")
+        cls.l_1 = HtnLabel("l1")
+        cls.l_2 = HtnLabel("l2")
+        cls.l_3 = HtnLabel("l3")
+        cls.l_4 = HtnLabel("l4")
+        cls.l_5 = HtnLabel("l5")
 
         # State Variables
-        self.sv_at_robot_location = HtnStateVariable(
-            self.s_sv_at, (self.v_robot, self.v_location)
-        )
-        self.sv_at_package_location = HtnStateVariable(
-            self.s_sv_at, (self.v_package, self.v_location)
+        cls.sv_at_robot_location = HtnStateVariable(
+            cls.s_sv_at, (cls.v_robot, cls.v_location)
         )
-        self.sv_at_robot_from = HtnStateVariable(
-            self.s_sv_at, (self.v_robot, self.v_from)
+        cls.sv_at_package_location = HtnStateVariable(
+            cls.s_sv_at, (cls.v_package, cls.v_location)
         )
-        self.sv_at_package_from = HtnStateVariable(
-            self.s_sv_at, (self.v_package, self.v_from)
+        cls.sv_at_robot_from = HtnStateVariable(cls.s_sv_at, (cls.v_robot, cls.v_from))
+        cls.sv_at_package_from = HtnStateVariable(
+            cls.s_sv_at, (cls.v_package, cls.v_from)
         )
-        self.sv_at_robot_to = HtnStateVariable(self.s_sv_at, (self.v_robot, self.v_to))
-        self.sv_holding_robot_package = HtnStateVariable(
-            self.s_sv_holding, (self.v_robot, self.v_package)
-        )
-        self.sv_empty_robot = HtnStateVariable(self.s_sv_empty, (self.v_robot,))
-        self.sv_path_from_to = HtnStateVariable(
-            self.s_sv_path, (self.v_from, self.v_to)
+        cls.sv_at_robot_to = HtnStateVariable(cls.s_sv_at, (cls.v_robot, cls.v_to))
+        cls.sv_holding_robot_package = HtnStateVariable(
+            cls.s_sv_holding, (cls.v_robot, cls.v_package)
         )
+        cls.sv_empty_robot = HtnStateVariable(cls.s_sv_empty, (cls.v_robot,))
+        cls.sv_path_from_to = HtnStateVariable(cls.s_sv_path, (cls.v_from, cls.v_to))
 
         # Actions
-        self.p_move = HtnPrimitiveTask(
-            self.s_p_move,
-            (self.v_robot, self.v_from, self.v_to),
-            constraints=(HtnConstraint(self.v_from, self.v_to, "!="),),
+        cls.p_move = HtnPrimitiveTask(
+            cls.s_p_move,
+            (cls.v_robot, cls.v_from, cls.v_to),
+            constraints=(HtnConstraint(cls.v_from, cls.v_to, "!="),),
             conditions=(
                 HtnCondition(
-                    self.sv_at_robot_from,
+                    cls.sv_at_robot_from,
                 ),
-                HtnCondition(self.sv_path_from_to),
+                HtnCondition(cls.sv_path_from_to),
             ),
             effects=(
                 HtnEffect(
-                    self.sv_at_robot_from,
+                    cls.sv_at_robot_from,
                     HTN_FALSE,
                 ),
                 HtnEffect(
-                    self.sv_at_robot_to,
+                    cls.sv_at_robot_to,
                     HTN_TRUE,
                 ),
             ),
         )
-        self.p_move_durative = HtnPrimitiveTask(
-            self.s_p_move,
-            (self.v_robot, self.v_from, self.v_to),
-            interval=HtnTemporalInterval(self.v_time_start, self.v_time_end),
+        at_start = HtnTemporalInterval(cls.v_time_start, cls.v_time_start)
+        at_end = HtnTemporalInterval(cls.v_time_end, cls.v_time_end)
+        over_all = HtnTemporalInterval(cls.v_time_start, cls.v_time_end)
+        cls.p_move_durative = HtnPrimitiveTask(
+            cls.s_p_move,
+            (cls.v_robot, cls.v_from, cls.v_to),
+            interval=over_all,
             constraints=(
-                HtnConstraint(self.v_from, self.v_to, "!="),
-                HtnConstraint(self.v_time_end, self.v_time_start + 10, "=="),
+                HtnConstraint(cls.v_from, cls.v_to, "!="),
+                HtnConstraint(cls.v_time_end, cls.v_time_start + 10, "=="),
             ),
             conditions=(
                 HtnCondition(
-                    self.sv_at_robot_from,
+                    cls.sv_at_robot_from,
                     HTN_TRUE,
-                    HtnTemporalInterval(self.v_time_start, self.v_time_start),
+                    at_start,
                 ),
                 HtnCondition(
-                    self.sv_path_from_to,
+                    cls.sv_path_from_to,
                     HTN_TRUE,
-                    HtnTemporalInterval(self.v_time_start, self.v_time_end),
+                    over_all,
                 ),
             ),
             effects=(
                 HtnEffect(
-                    self.sv_at_robot_from,
+                    cls.sv_at_robot_from,
                     HTN_FALSE,
-                    HtnTemporalInterval(self.v_time_start, self.v_time_start),
+                    at_start,
                 ),
                 HtnEffect(
-                    self.sv_at_robot_to,
+                    cls.sv_at_robot_to,
                     HTN_TRUE,
-                    HtnTemporalInterval(self.v_time_end, self.v_time_end),
+                    at_end,
                 ),
             ),
         )
-        self.p_pick = HtnPrimitiveTask(
-            self.s_p_pick,
-            (self.v_robot, self.v_package, self.v_location),
+        cls.p_pick = HtnPrimitiveTask(
+            cls.s_p_pick,
+            (cls.v_robot, cls.v_package, cls.v_location),
             conditions=(
-                HtnCondition(self.sv_at_robot_location),
-                HtnCondition(self.sv_at_package_location),
-                HtnCondition(self.sv_empty_robot),
+                HtnCondition(cls.sv_at_robot_location),
+                HtnCondition(cls.sv_at_package_location),
+                HtnCondition(cls.sv_empty_robot),
             ),
             effects=(
-                HtnEffect(self.sv_at_package_location, HTN_FALSE),
-                HtnEffect(self.sv_empty_robot, HTN_FALSE),
-                HtnEffect(self.sv_holding_robot_package, HTN_TRUE),
+                HtnEffect(cls.sv_at_package_location, HTN_FALSE),
+                HtnEffect(cls.sv_empty_robot, HTN_FALSE),
+                HtnEffect(cls.sv_holding_robot_package, HTN_TRUE),
             ),
         )
-        self.p_pick_from = HtnPrimitiveTask(
-            self.s_p_pick,
-            (self.v_robot, self.v_package, self.v_from),
+        cls.p_pick_from = HtnPrimitiveTask(
+            cls.s_p_pick,
+            (cls.v_robot, cls.v_package, cls.v_from),
             conditions=(
-                HtnCondition(self.sv_at_robot_from),
-                HtnCondition(self.sv_at_package_from),
-                HtnCondition(self.sv_empty_robot),
+                HtnCondition(cls.sv_at_robot_from),
+                HtnCondition(cls.sv_at_package_from),
+                HtnCondition(cls.sv_empty_robot),
             ),
             effects=(
-                HtnEffect(self.sv_at_package_from, HTN_FALSE),
-                HtnEffect(self.sv_empty_robot, HTN_FALSE),
-                HtnEffect(self.sv_holding_robot_package, HTN_TRUE),
+                HtnEffect(cls.sv_at_package_from, HTN_FALSE),
+                HtnEffect(cls.sv_empty_robot, HTN_FALSE),
+                HtnEffect(cls.sv_holding_robot_package, HTN_TRUE),
             ),
         )
-        self.p_drop = HtnPrimitiveTask(
-            self.s_p_drop,
-            (self.v_robot, self.v_package, self.v_location),
+        cls.p_drop = HtnPrimitiveTask(
+            cls.s_p_drop,
+            (cls.v_robot, cls.v_package, cls.v_location),
             conditions=(
-                HtnCondition(self.sv_at_robot_location),
-                HtnCondition(self.sv_holding_robot_package),
+                HtnCondition(cls.sv_at_robot_location),
+                HtnCondition(cls.sv_holding_robot_package),
             ),
             effects=(
-                HtnEffect(self.sv_at_package_location, HTN_TRUE),
-                HtnEffect(self.sv_empty_robot, HTN_TRUE),
-                HtnEffect(self.sv_holding_robot_package, HTN_FALSE),
+                HtnEffect(cls.sv_at_package_location, HTN_TRUE),
+                HtnEffect(cls.sv_empty_robot, HTN_TRUE),
+                HtnEffect(cls.sv_holding_robot_package, HTN_FALSE),
             ),
         )
-        self.p_speak = HtnPrimitiveTask(self.s_p_speak, (self.v_robot,))
+        cls.p_speak = HtnPrimitiveTask(cls.s_p_speak, (cls.v_robot,))
 
         # Tasks
-        self.c_go = HtnCompoundTask(self.s_c_go, (self.v_robot, self.v_location))
-        self.c_go_to = HtnCompoundTask(self.s_c_go, (self.v_robot, self.v_to))
-        self.c_go_from = HtnCompoundTask(self.s_c_go, (self.v_robot, self.v_from))
-        self.c_transfer = HtnCompoundTask(
-            self.s_c_transfer, (self.v_package, self.v_location)
+        cls.c_go = HtnCompoundTask(cls.s_c_go, (cls.v_robot, cls.v_location))
+        cls.c_go_to = HtnCompoundTask(cls.s_c_go, (cls.v_robot, cls.v_to))
+        cls.c_go_from = HtnCompoundTask(cls.s_c_go, (cls.v_robot, cls.v_from))
+        cls.c_transfer = HtnCompoundTask(
+            cls.s_c_transfer, (cls.v_package, cls.v_location)
         )
 
         # Methods
-        self.m_go = HtnMethod(
-            self.c_go_to,
-            HtnTaskNetwork((HtnLabelMappingPair(self.l_1, self.p_move),)),
-            symbol=self.s_m_go,
-        )
-        self.m_go_durative = HtnMethod(
-            self.c_go_to,
-            HtnTaskNetwork((HtnLabelMappingPair(self.l_1, self.p_move_durative),)),
-            symbol=self.s_m_go,
-        )
-        self.m_already_there = HtnMethod(
-            self.c_go,
+        cls.m_go = HtnMethod(
+            cls.c_go_to,
+            HtnTaskNetwork((HtnLabelMappingPair(cls.l_1, cls.p_move),)),
+            symbol=cls.s_m_go,
+        )
+        cls.m_go_durative = HtnMethod(
+            cls.c_go_to,
+            HtnTaskNetwork((HtnLabelMappingPair(cls.l_1, cls.p_move_durative),)),
+            symbol=cls.s_m_go,
+        )
+        cls.m_already_there = HtnMethod(
+            cls.c_go,
             HtnTaskNetwork(),
-            conditions=(HtnCondition(self.sv_at_robot_location),),
-            symbol=self.s_m_already_there,
+            conditions=(HtnCondition(cls.sv_at_robot_location),),
+            symbol=cls.s_m_already_there,
         )
-        self.m_transfer = HtnMethod(
-            self.c_transfer,
+        cls.m_transfer = HtnMethod(
+            cls.c_transfer,
             HtnTaskNetwork(
                 (
-                    HtnLabelMappingPair(self.l_2, self.c_go_from),
-                    HtnLabelMappingPair(self.l_3, self.p_pick_from),
-                    HtnLabelMappingPair(self.l_4, self.c_go_to),
-                    HtnLabelMappingPair(self.l_5, self.p_drop),
+                    HtnLabelMappingPair(cls.l_2, cls.c_go_from),
+                    HtnLabelMappingPair(cls.l_3, cls.p_pick_from),
+                    HtnLabelMappingPair(cls.l_4, cls.c_go_to),
+                    HtnLabelMappingPair(cls.l_5, cls.p_drop),
                 ),
                 (
                     HtnTemporalConstraint(
-                        self.c_go_from.end,
-                        self.p_pick_from.start,
+                        cls.c_go_from.end,
+                        cls.p_pick_from.start,
                         "<=",
-                        self.l_2,
-                        self.l_3,
+                        cls.l_2,
+                        cls.l_3,
                     ),
                     HtnTemporalConstraint(
-                        self.p_pick_from.end,
-                        self.c_go_to.start,
+                        cls.p_pick_from.end,
+                        cls.c_go_to.start,
                         "<=",
-                        self.l_3,
-                        self.l_4,
+                        cls.l_3,
+                        cls.l_4,
                     ),
                     HtnTemporalConstraint(
-                        self.c_go_to.end, self.p_drop.start, "<=", self.l_4, self.l_5
+                        cls.c_go_to.end, cls.p_drop.start, "<=", cls.l_4, cls.l_5
                     ),
                 ),
             ),
-            symbol=self.s_m_transfer,
+            symbol=cls.s_m_transfer,
         )
-        self.m_already_transferred = HtnMethod(
-            self.c_transfer,
+        cls.m_already_transferred = HtnMethod(
+            cls.c_transfer,
             HtnTaskNetwork(),
-            conditions=(HtnCondition(self.sv_at_package_location),),
-            symbol=self.s_m_already_transferred,
+            conditions=(HtnCondition(cls.sv_at_package_location),),
+            symbol=cls.s_m_already_transferred,
         )
 
         # Language
-        self.language = HtnLanguage(
+        cls.language = HtnLanguage(
             {
-                self.v_from,
-                self.v_to,
-                self.v_location,
-                self.v_locatable,
-                self.v_robot,
-                self.v_package,
-                self.v_time_start,
-                self.v_time_end,
+                cls.v_from,
+                cls.v_to,
+                cls.v_location,
+                cls.v_locatable,
+                cls.v_robot,
+                cls.v_package,
+                cls.v_time_start,
+                cls.v_time_end,
             },
-            {self.o_loc0, self.o_loc1, self.o_loc2, self.o_package, self.o_robot},
-            {self.s_sv_at, self.s_sv_holding, self.s_sv_empty, self.s_sv_path},
-            {self.s_p_drop, self.s_p_move, self.s_p_pick},
-            {self.s_c_go, self.s_c_transfer},
-            {self.l_0, self.l_1, self.l_2, self.l_3, self.l_4, self.l_5},
+            {cls.o_loc0, cls.o_loc1, cls.o_loc2, cls.o_package, cls.o_robot},
+            {cls.s_sv_at, cls.s_sv_holding, cls.s_sv_empty, cls.s_sv_path},
+            {cls.s_p_drop, cls.s_p_move, cls.s_p_pick},
+            {cls.s_c_go, cls.s_c_transfer},
+            {cls.l_0, cls.l_1, cls.l_2, cls.l_3, cls.l_4, cls.l_5},
         )
 
         # Domain
-        self.domain = HtnDomain(
-            self.language,
-            {self.p_drop, self.p_move, self.p_pick, self.p_pick_from},
-            {self.c_go, self.c_go_to, self.c_go_from, self.c_transfer},
+        cls.domain = HtnDomain(
+            cls.language,
+            {cls.p_drop, cls.p_move, cls.p_pick, cls.p_pick_from},
+            {cls.c_go, cls.c_go_to, cls.c_go_from, cls.c_transfer},
             {
-                self.m_go,
-                self.m_already_there,
-                self.m_transfer,
-                self.m_already_transferred,
+                cls.m_go,
+                cls.m_already_there,
+                cls.m_transfer,
+                cls.m_already_transferred,
             },
         )
-        self.domain_durative = HtnDomain(
-            self.language,
-            {self.p_drop, self.p_move_durative, self.p_pick, self.p_pick_from},
-            {self.c_go, self.c_go_to, self.c_go_from, self.c_transfer},
-            {
-                self.m_go_durative,
-                self.m_already_there,
-                self.m_transfer,
-                self.m_already_transferred,
-            },
+        # Shares the language of `domain`.
+        cls.domain_durative = cls.domain.copy_with(
+            Tp=cls.domain.Tp - {cls.p_move} | {cls.p_move_durative},
+            Tc=set(cls.domain.Tc),
+            M=cls.domain.M - {cls.m_go} | {cls.m_go_durative},
         )
 
         # Problem
-        self.goal = HtnTaskNetwork(
+        cls.goal = HtnTaskNetwork(
             (
                 HtnLabelMappingPair(
-                    self.l_0,
-                    HtnCompoundTask(self.s_c_transfer, (self.o_package, self.o_loc2)),
+                    cls.l_0,
+                    HtnCompoundTask(cls.s_c_transfer, (cls.o_package, cls.o_loc2)),
                 ),
             ),
         )
-        self.sv_at_robot_loc0 = HtnStateVariable(
-            self.s_sv_at, (self.o_robot, self.o_loc0)
-        )
-        self.sv_at_package_loc1 = HtnStateVariable(
-            self.s_sv_at, (self.o_package, self.o_loc1)
-        )
-        self.sv_empty_robot_o = HtnStateVariable(self.s_sv_empty, (self.o_robot,))
-        self.sv_path_loc0_loc1 = HtnStateVariable(
-            self.s_sv_path, (self.o_loc0, self.o_loc1)
-        )
-        self.sv_path_loc0_loc2 = HtnStateVariable(
-            self.s_sv_path, (self.o_loc0, self.o_loc2)
-        )
-        self.sv_path_loc1_loc0 = HtnStateVariable(
-            self.s_sv_path, (self.o_loc1, self.o_loc0)
-        )
-        self.sv_path_loc1_loc2 = HtnStateVariable(
-            self.s_sv_path, (self.o_loc1, self.o_loc2)
-        )
-        self.sv_path_loc2_loc0 = HtnStateVariable(
-            self.s_sv_path, (self.o_loc2, self.o_loc0)
-        )
-        self.sv_path_loc2_loc1 = HtnStateVariable(
-            self.s_sv_path, (self.o_loc2, self.o_loc1)
-        )
-        self.i_robot_loc0 = HtnEffect(
-            self.sv_at_robot_loc0,
+        cls.sv_at_robot_loc0 = HtnStateVariable(cls.s_sv_at, (cls.o_robot, cls.o_loc0))
+        cls.sv_at_package_loc1 = HtnStateVariable(
+            cls.s_sv_at, (cls.o_package, cls.o_loc1)
+        )
+        cls.sv_empty_robot_o = HtnStateVariable(cls.s_sv_empty, (cls.o_robot,))
+        # Paths between every ordered pair of distinct locations.
+        cls.sv_path_loc0_loc1 = HtnStateVariable(
+            cls.s_sv_path, (cls.o_loc0, cls.o_loc1)
+        )
+        cls.sv_path_loc0_loc2 = HtnStateVariable(
+            cls.s_sv_path, (cls.o_loc0, cls.o_loc2)
+        )
+        cls.sv_path_loc1_loc0 = HtnStateVariable(
+            cls.s_sv_path, (cls.o_loc1, cls.o_loc0)
+        )
+        cls.sv_path_loc1_loc2 = HtnStateVariable(
+            cls.s_sv_path, (cls.o_loc1, cls.o_loc2)
+        )
+        cls.sv_path_loc2_loc0 = HtnStateVariable(
+            cls.s_sv_path, (cls.o_loc2, cls.o_loc0)
+        )
+        cls.sv_path_loc2_loc1 = HtnStateVariable(
+            cls.s_sv_path, (cls.o_loc2, cls.o_loc1)
+        )
+        cls.i_path_loc0_loc1 = HtnEffect(cls.sv_path_loc0_loc1, HTN_TRUE)
+        cls.i_path_loc0_loc2 = HtnEffect(cls.sv_path_loc0_loc2, HTN_TRUE)
+        cls.i_path_loc1_loc0 = HtnEffect(cls.sv_path_loc1_loc0, HTN_TRUE)
+        cls.i_path_loc1_loc2 = HtnEffect(cls.sv_path_loc1_loc2, HTN_TRUE)
+        cls.i_path_loc2_loc0 = HtnEffect(cls.sv_path_loc2_loc0, HTN_TRUE)
+        cls.i_path_loc2_loc1 = HtnEffect(cls.sv_path_loc2_loc1, HTN_TRUE)
+        cls.i_paths = [
+            cls.i_path_loc0_loc1,
+            cls.i_path_loc0_loc2,
+            cls.i_path_loc1_loc0,
+            cls.i_path_loc1_loc2,
+            cls.i_path_loc2_loc0,
+            cls.i_path_loc2_loc1,
+        ]
+        cls.i_robot_loc0 = HtnEffect(
+            cls.sv_at_robot_loc0,
             HTN_TRUE,
         )
-        self.i_package_loc1 = HtnEffect(
-            self.sv_at_package_loc1,
+        cls.i_package_loc1 = HtnEffect(
+            cls.sv_at_package_loc1,
             HTN_TRUE,
         )
-        self.i_robot_empty = HtnEffect(self.sv_empty_robot_o, HTN_TRUE)
-        self.i_path_loc0_loc1 = HtnEffect(self.sv_path_loc0_loc1, HTN_TRUE)
-        self.i_path_loc0_loc2 = HtnEffect(self.sv_path_loc0_loc2, HTN_TRUE)
-        self.i_path_loc1_loc0 = HtnEffect(self.sv_path_loc1_loc0, HTN_TRUE)
-        self.i_path_loc1_loc2 = HtnEffect(self.sv_path_loc1_loc2, HTN_TRUE)
-        self.i_path_loc2_loc0 = HtnEffect(self.sv_path_loc2_loc0, HTN_TRUE)
-        self.i_path_loc2_loc1 = HtnEffect(self.sv_path_loc2_loc1, HTN_TRUE)
-        self.problem = HtnProblem(
-            self.domain,
-            {
-                self.i_robot_loc0,
-                self.i_package_loc1,
-                self.i_robot_empty,
-                self.i_path_loc0_loc1,
-                self.i_path_loc0_loc2,
-                self.i_path_loc1_loc0,
-                self.i_path_loc1_loc2,
-                self.i_path_loc2_loc0,
-                self.i_path_loc2_loc1,
-            },
-            self.goal,
+        cls.i_robot_empty = HtnEffect(cls.sv_empty_robot_o, HTN_TRUE)
+        initial_state = {
+            cls.i_robot_loc0,
+            cls.i_package_loc1,
+            cls.i_robot_empty,
+            *cls.i_paths,
+        }
+        cls.problem = HtnProblem(
+            cls.domain,
+            set(initial_state),
+            cls.goal,
             name="transfer",
         )
-        self.problem_durative = HtnProblem(
-            self.domain_durative,
-            {
-                self.i_robot_loc0,
-                self.i_package_loc1,
-                self.i_robot_empty,
-                self.i_path_loc0_loc1,
-                self.i_path_loc0_loc2,
-                self.i_path_loc1_loc0,
-                self.i_path_loc1_loc2,
-                self.i_path_loc2_loc0,
-                self.i_path_loc2_loc1,
-            },
-            self.goal,
+        cls.problem_durative = HtnProblem(
+            cls.domain_durative,
+            set(initial_state),
+            cls.goal,
             name="transfer-temporal",
         )
+
+    def setUp(self) -> None:
+        """
+        Gives each test its own copy of the mutable entities, e.g. the domains.
+        """
+        super().setUp()
+        # A single `deepcopy` keeps the entities shared between them,
+        # e.g. both domains still have the same language.
+        self.problem, self.problem_durative = deepcopy(
+            (self.problem, self.problem_durative)
+        )
+        self.domain = self.problem.D
+        self.domain_durative = self.problem_durative.D
+        self.language = self.domain.L
@@ -1,12 +1,22 @@
+import gc
+import weakref
+
 from temporal_htn.htn import (
     HTN_TIMEPOINT,
     HtnConstraint,
+    HtnDomain,
+    HtnLanguage,
+    HtnPrimitiveTask,
+    HtnPrimitiveTaskSymbol,
+    HtnProblem,
     HtnTemporalConstraint,
     HtnTemporalInterval,
 )
-from temporal_htn.lcp_converter import (
+from temporal_htn.lcp_converter import (  # pylint: disable=protected-access
+    _PAYLOADS,
     ChroniclesProblem,
     ChronicleSymbolType,
+    UnregisteredSymbolError,
     get_constraint,
     get_interval,
     get_timepoint,
@@ -207,6 +217,22 @@ class TestChronicles(AbstractTest):
                 },
             )
 
+    def test_symbols(self) -> None:
+        """
+        Checks that several `HtnSymbol` of the same type are correctly converted.
+        """
+        self.ch_problem.add_symbols(
+            [self.s_p_move, self.s_p_drop, self.s_p_move], ChronicleSymbolType.ACTION
+        )
+        self.ch_problem.add_symbols([self.s_c_go], ChronicleSymbolType.TASK)
+        self.assertSetEqual(
+            self.ch_problem.symbols, {self.s_p_move, self.s_p_drop, self.s_c_go}
+        )
+        with self.assertRaises(ValueError):
+            self.ch_problem.add_symbols([self.s_sv_at], ChronicleSymbolType.CONSTANT)
+        with self.assertRaises(RuntimeError):
+            self.ch_problem.add_symbols([self.s_sv_at], None)  # type: ignore
+
     def test_symbol_table_creation(self, assertion: bool = True) -> None:
         """
         Checks that the symbol table is correctly created.
@@ -265,6 +291,19 @@ class TestChronicles(AbstractTest):
                 },
             )
 
+    def test_state_variables(self) -> None:
+        """
+        Checks that several `HtnStateVariable` are correctly converted.
+        """
+        self.test_symbol_table_creation(False)
+        self.ch_problem.add_state_variables(
+            [self.sv_at_robot_from, self.sv_path_from_to, self.sv_at_robot_from]
+        )
+        self.assertSetEqual(
+            self.ch_problem.state_variables,
+            {self.sv_at_robot_from, self.sv_path_from_to},
+        )
+
     def test_context_creation(self, assertion: bool = True) -> None:
         """
         Checks that the context and the initial chronicle are correctly created.
@@ -347,8 +386,57 @@ class TestChronicles(AbstractTest):
                 },
             )
 
+    def test_unregistered_symbol(self) -> None:
+        """
+        Checks that an entity referring to an unregistered symbol is rejected
+        before reaching chronicles, whether it is converted or reused.
+        """
+        s_p_drop_new = HtnPrimitiveTaskSymbol("drop-new")
+        p_drop_new = self.p_drop.copy_with(symbol=s_p_drop_new)
+        ChroniclesProblem.from_htn(self.problem_durative)  # converts `p_drop`
+        self.ch_problem.add_symbols(
+            [s_p_drop_new, self.s_p_drop], ChronicleSymbolType.ACTION
+        )
+        self.ch_problem.create_symbol_table()
+        self.ch_problem.create_context()
+        with self.assertRaises(UnregisteredSymbolError):
+            self.ch_problem.add_action(p_drop_new)
+        with self.assertRaises(UnregisteredSymbolError):
+            self.ch_problem.add_action(self.p_drop)
+        with self.assertRaises(UnregisteredSymbolError):
+            self.ch_problem.get_signature_temporal(self.p_move_durative)
+
     def test_complete_conversion(self) -> None:
         """
         Checks that a `HtnProblem` is correctly converted.
         """
         self.ch_problem = ChroniclesProblem.from_htn(self.problem_durative)
+
+    def test_reconversion(self) -> None:
+        """
+        Checks that converting a `HtnProblem` again reuses its converted
+        actions and methods.
+        """
+        first = ChroniclesProblem.from_htn(self.problem_durative)
+        payloads = {
+            entity: _PAYLOADS[entity] for entity in first.actions | first.methods
+        }
+        second = ChroniclesProblem.from_htn(self.problem_durative)
+        self.assertSetEqual(second.actions, first.actions)
+        self.assertSetEqual(second.methods, first.methods)
+        for entity, payload in payloads.items():
+            self.assertIs(_PAYLOADS[entity], payload)
+
+    def test_payloads_release(self) -> None:
+        """
+        Checks that the converted actions are not kept alive by the conversion.
+        """
+        s_p_probe = HtnPrimitiveTaskSymbol("probe")
+        p_probe = HtnPrimitiveTask(s_p_probe, ())
+        problem = HtnProblem(HtnDomain(HtnLanguage(Prims={s_p_probe}), Tp={p_probe}))
+        ch_problem = ChroniclesProblem.from_htn(problem)
+        self.assertIn(p_probe, _PAYLOADS)
+        p_probe_ref = weakref.ref(p_probe)
+        del p_probe, problem, ch_problem
+        gc.collect()
+        self.assertIsNone(p_probe_ref())
@@ -5,9 +5,12 @@ from temporal_htn import (
     HtnCondition,
     HtnConstantTimepoint,
     HtnConstraint,
+    HtnDomain,
     HtnEffect,
+    HtnStateVariable,
     HtnTemporalInterval,
     HtnTemporalIntervalFactory,
+    HtnVariableTimepoint,
 )
 
 from .abstract_test import AbstractTest
@@ -47,6 +50,30 @@ class TestHTNCreation(AbstractTest):
         with self.assertRaises(ValueError):
             self.v_time_start + "plop"  # pylint: disable=pointless-statement
 
+    def test_timepoint_scaled_delay(self) -> None:
+        """
+        Checks that timepoint delays are compared in `HTN_TIME_SCALE` units.
+        """
+        delayed = self.v_time_start + 0.1 + 0.2
+        self.assertEqual(delayed.scaled_delay, 3)
+        self.assertEqual(delayed, self.v_time_start + 0.3)
+        self.assertEqual(hash(delayed), hash(self.v_time_start + 0.3))
+        built = HtnVariableTimepoint("?ts", delay=0.3)
+        self.assertEqual(delayed, built)
+        self.assertEqual(hash(delayed), hash(built))
+        self.assertEqual(repr(delayed), repr(built))
+        self.assertEqual(delayed - 0.3, self.v_time_start)
+        self.assertIs(delayed + 0, delayed)
+        with self.assertRaises(ValueError):
+            self.v_time_start + 0.05  # pylint: disable=pointless-statement
+        # The delays which are not a multiple of HTN_EPSILON are rejected too.
+        for delay in (0.05, 0.16, 0.25):
+            with self.assertRaises(ValueError):
+                HtnVariableTimepoint("?ts", delay=delay)
+        delayed = HtnVariableTimepoint("?ts", delay=0.1 + 0.2)
+        self.assertEqual(delayed.scaled_delay, 3)
+        self.assertEqual(delayed.delay, 0.1 + 0.2)
+
     def test_timepoint_str(self) -> None:
         """
         Checks the str format of a `HtnTimepoint`.
@@ -61,6 +88,26 @@ class TestHTNCreation(AbstractTest):
         self.assertEqual(str(HtnTemporalIntervalFactory.at_end()), "at-end ")
         self.assertEqual(str(HtnTemporalIntervalFactory.over_all()), "over-all ")
 
+    def test_many_intervals(self) -> None:
+        """
+        Checks that intervals created in bulk are distinct and tagged.
+        """
+        intervals = HtnTemporalIntervalFactory.many("over_all", 3)
+        self.assertEqual(len(intervals), 3)
+        timepoints = {
+            timepoint
+            for interval in intervals
+            for timepoint in (interval.start, interval.end)
+        }
+        self.assertEqual(len(timepoints), 6)
+        for interval in intervals:
+            self.assertEqual(str(interval), "over-all ")
+        self.assertEqual(HtnTemporalIntervalFactory.many("default", 0), ())
+        counter = HtnTemporalIntervalFactory.counter
+        with self.assertRaises(ValueError):
+            HtnTemporalIntervalFactory.many("default", -2)
+        self.assertEqual(HtnTemporalIntervalFactory.counter, counter)
+
     def test_symbol_str(self) -> None:
         """
         Checks the str format of a `HtnSymbol`.
@@ -83,6 +130,19 @@ class TestHTNCreation(AbstractTest):
             str(self.sv_at_package_location), "at(?p - package, ?loc - location)"
         )
 
+    def test_state_variable_eq(self) -> None:
+        """
+        Checks that the parameters of a `HtnStateVariable` are compared in order.
+        """
+        self.assertEqual(
+            self.sv_path_from_to,
+            HtnStateVariable(self.s_sv_path, (self.v_from, self.v_to)),
+        )
+        self.assertNotEqual(
+            self.sv_path_from_to,
+            HtnStateVariable(self.s_sv_path, (self.v_to, self.v_from)),
+        )
+
     def test_condition_str(self) -> None:
         """
         Checks the str format of a `HtnCondition`.
@@ -146,6 +206,17 @@ class TestHTNCreation(AbstractTest):
             "[?ts, ?te] move(?r - robot, ?from - location, ?to - location)",
         )
 
+    def test_task_network(self) -> None:
+        """
+        Checks that the tasks and labels of a `HtnTaskNetwork` follow its mapping.
+        """
+        task_network = self.m_transfer.task_network
+        self.assertEqual(
+            task_network.tasks,
+            (self.c_go_from, self.p_pick_from, self.c_go_to, self.p_drop),
+        )
+        self.assertEqual(task_network.labels, (self.l_2, self.l_3, self.l_4, self.l_5))
+
     def test_problem(self) -> None:
         """
         Creates a complex HTN problem and returns it.
@@ -173,3 +244,56 @@ class TestHTNCreation(AbstractTest):
                 self.sv_path_loc2_loc1,
             },
         )
+
+    def test_problem_copy_with(self) -> None:
+        """
+        Checks that a copy of a `HtnProblem` does not share its containers.
+        """
+        copied = self.problem.copy_with()
+        self.assertEqual(copied, self.problem)
+        copied.s_I.clear()
+        copied.D.Tp.clear()
+        copied.D.L.Csts.clear()
+        self.assertTrue(self.problem.s_I)
+        self.assertTrue(self.problem.D.Tp)
+        self.assertTrue(self.problem.D.L.Csts)
+        # The immutable entities are shared.
+        self.assertIs(copied.tn_I, self.problem.tn_I)
+
+    def test_domain_add_method(self) -> None:
+        """
+        Checks that a method and its tasks are added to a `HtnDomain`.
+        """
+        self.domain.add_method(self.m_go_durative)
+        self.assertIn(self.m_go_durative, self.domain.M)
+        self.assertIn(self.p_move_durative, self.domain.Tp)
+        self.assertIn(self.s_p_move, self.language.Prims)
+        # The fixture shared by the tests is left untouched.
+        self.assertNotIn(self.m_go_durative, type(self).domain.M)
+
+    def test_domain_state_variables_cache(self) -> None:
+        """
+        Checks that the state variables of a `HtnDomain` follow its modifications.
+        """
+        domain = HtnDomain()
+        self.assertEqual(domain.state_variables, set())
+        domain.merge(self.domain_durative)
+        self.assertIs(domain.state_variables, domain.state_variables)
+        self.assertEqual(domain.state_variables, self.domain_durative.state_variables)
+        domain = HtnDomain()
+        self.assertEqual(domain.state_variables, set())
+        domain.add_task(self.p_drop)
+        self.assertEqual(domain.state_variables, set(self.p_drop.state_variables))
+        # `Tp` and `M` are public, they can also be modified directly.
+        domain = HtnDomain()
+        self.assertEqual(domain.state_variables, set())
+        domain.Tp.add(self.p_drop)
+        self.assertEqual(domain.state_variables, self.p_drop.state_variables)
+        domain.M.add(self.m_already_transferred)
+        self.assertEqual(
+            domain.state_variables,
+            self.p_drop.state_variables | self.m_already_transferred.state_variables,
+        )
+        domain.Tp.clear()
+        domain.M.clear()
+        self.assertEqual(domain.state_variables, set())
@@ -2,15 +2,16 @@
 
 from __future__ import annotations
 
-import inspect
-import sys
+import pickle
+from copy import deepcopy
+from itertools import chain
 from dataclasses import dataclass
 from unittest import TestCase
 
 import temporal_htn.htn as htnf
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MockHtnEntity(htnf.HtnEntity):
     """A mock HTN Entity for tests."""
 
@@ -36,13 +37,10 @@ class HtnEntityTest(TestCase):
             htnf.ConstraintArgumentError,
             htnf.HtnConstraintFactory,
         ]  # Just helper classes
-        htnf_class_pairs = inspect.getmembers(
-            sys.modules[htnf.__name__], inspect.isclass
-        )
         htnf_classes = [
-            htnf_class_pair[1]
-            for htnf_class_pair in htnf_class_pairs
-            if htnf_class_pair[1] not in excluded_classes
+            htnf_class
+            for htnf_class in (getattr(htnf, name) for name in htnf.__all__)
+            if isinstance(htnf_class, type) and htnf_class not in excluded_classes
         ]
         # assert
         for htnf_class in htnf_classes:
@@ -105,3 +103,113 @@ class HtnEntityTest(TestCase):
             entity,
             MockHtnEntity({"foo"}, True, 1, (1, 2), [1, 2], {"1": 1}),
         )
+
+    def test_copy_and_extend_with_empty(self) -> None:
+        """
+        Check that copy_and_extend_with() keeps the attributes with empty extensions.
+        """
+        # arrange
+        entity = MockHtnEntity({"foo"}, True, 1, (1, 2), [1, 2], {"1": 1})
+        # act
+        entity_extended = entity.copy_and_extend_with(
+            set_attr=set(), tuple_attr=(), list_attr=[], dict_attr={}
+        )
+        # assert
+        self.assertEqual(entity_extended, entity)
+        self.assertIs(entity_extended.tuple_attr, entity.tuple_attr)
+        extension = (3, 4)
+        entity_extended = entity.copy_with(tuple_attr=()).copy_and_extend_with(
+            tuple_attr=extension
+        )
+        self.assertIs(entity_extended.tuple_attr, extension)
+
+    def test_copy_and_extend_with_iterables(self) -> None:
+        """
+        Check that copy_and_extend_with() accepts any iterable as extension.
+        """
+        # arrange
+        entity = MockHtnEntity({"foo"}, True, 1, (1, 2), [1, 2], {"1": 1})
+        # act
+        entity_extended = entity.copy_and_extend_with(
+            set_attr=iter(["bar"]),
+            tuple_attr=chain((3,), [4, 5]),
+            list_attr=range(3, 5),
+            dict_attr=[("2", 2)],
+        )
+        # assert
+        self.assertEqual(
+            entity_extended,
+            MockHtnEntity(
+                {"foo", "bar"},
+                True,
+                1,
+                (1, 2, 3, 4, 5),
+                [1, 2, 3, 4],
+                {"1": 1, "2": 2},
+            ),
+        )
+        self.assertEqual(
+            entity,
+            MockHtnEntity({"foo"}, True, 1, (1, 2), [1, 2], {"1": 1}),
+        )
+
+    def test_deepcopy(self) -> None:
+        """
+        Check that deepcopy() shares the immutable entities
+        and duplicates the containers of the mutable ones.
+        """
+        # arrange
+        tpe = htnf.HtnType("location")
+        constant = htnf.HtnConstant("L0", tpe)
+        language = htnf.HtnLanguage(Csts={constant})
+        # act
+        tpe_copied = deepcopy(tpe)
+        language_copied = deepcopy(language)
+        # assert
+        self.assertIs(tpe_copied, tpe)
+        self.assertEqual(language_copied, language)
+        self.assertIsNot(language_copied.Csts, language.Csts)
+        self.assertIs(next(iter(language_copied.Csts)), constant)
+
+    def test_interning(self) -> None:
+        """Check that equal types, objects, symbols and labels are shared."""
+        tpe = htnf.HtnType("location")
+        self.assertIs(htnf.HtnType("location"), tpe)
+        self.assertIs(htnf.HtnType(name="location", parent=None), tpe)
+        # pylint: disable=no-value-for-parameter,unexpected-keyword-arg
+        with self.assertRaises(TypeError):
+            htnf.HtnType()
+        with self.assertRaises(TypeError):
+            htnf.HtnType("location", plop=None)
+        self.assertIs(htnf.HtnConstant("L0", tpe), htnf.HtnConstant("L0", tpe))
+        self.assertIs(htnf.HtnLabel("l1"), htnf.HtnLabel("l1"))
+        self.assertIs(
+            htnf.HtnPrimitiveTaskSymbol("move"), htnf.HtnPrimitiveTaskSymbol("move")
+        )
+        self.assertIsNot(
+            htnf.HtnPrimitiveTaskSymbol("move"), htnf.HtnCompoundTaskSymbol("move")
+        )
+        self.assertIsNot(htnf.HtnConstant(1, tpe), htnf.HtnConstant(True, tpe))
+        self.assertIs(htnf.HtnVariable("?loc", tpe), htnf.HtnVariable("?loc", tpe))
+        self.assertIsNot(
+            htnf.HtnVariableTimepoint("?ts") + 1, htnf.HtnVariableTimepoint("?ts") + 1
+        )
+        self.assertEqual(
+            htnf.HtnVariableTimepoint("?ts") + 1, htnf.HtnVariableTimepoint("?ts") + 1
+        )
+        self.assertIsNot(
+            htnf.HtnVariableTimepoint("?ts"),
+            htnf.HtnVariable("?ts", htnf.HTN_TIMEPOINT),
+        )
+        symbol = htnf.HtnStateVariableSymbol("at")
+        params = (htnf.HtnVariable("?loc", tpe),)
+        self.assertIs(
+            htnf.HtnStateVariable(symbol, params), htnf.HtnStateVariable(symbol, params)
+        )
+        sv_one = htnf.HtnStateVariable(symbol, (htnf.HtnConstant(1, tpe),))
+        sv_true = htnf.HtnStateVariable(symbol, (htnf.HtnConstant(True, tpe),))
+        self.assertIsNot(sv_true, sv_one)
+        self.assertIs(sv_true.params[0].value, True)
+        self.assertIs(pickle.loads(pickle.dumps(htnf.HTN_TRUE)), htnf.HTN_TRUE)
+        name = "".join(["lo", "cation"])
+        self.assertIs(htnf.HtnStateVariableSymbol(name).name, tpe.name)
@@ -1,8 +1,14 @@
 """Tests the resolution of some HTN problems."""
 
+import functools
+import glob
 import logging
 import os
 import shutil
+import threading
+import time
+from itertools import zip_longest
+from typing import Callable, Iterable, Iterator
 
 from temporal_htn import (
     HTN_EPSILON,
@@ -41,6 +47,39 @@ from .abstract_test import AbstractTest
 logger = logging.getLogger(__name__)
 logger.addHandler(logging.StreamHandler())
 
+# Names of the `TestSolve` methods creating the problems to solve.
+_PROBLEM_GETTERS: list[str] = []
+
+
+def problem_getter(getter: Callable[..., HtnProblem]) -> Callable[..., HtnProblem]:
+    """Registers a problem getter, in definition order, to be run by `TestSolve`."""
+    _PROBLEM_GETTERS.append(getter.__name__)
+    return getter
+
+
+def _remove_stale_outputs() -> None:
+    """Deletes the plan directories moved aside by `TestSolve.setUpClass`."""
+    for stale in glob.glob("output.stale.*"):
+        shutil.rmtree(stale, ignore_errors=True)
+
+
+def _extract_plan(file: Iterable[str]) -> Iterator[str]:
+    """Yields the non-empty lines following the plan header of a plan file."""
+    for line in file:
+        if line == "**** Plan ****\n":
+            break
+    for line in file:
+        line = line.strip()
+        if line != "":
+            yield line
+
+
+@functools.lru_cache(maxsize=None)
+def _load_expected_plan(problem_name: str) -> tuple[str, ...]:
+    """Returns the lines of the expected plan of a problem, read once per run."""
+    with open(f"tests/expected_plans/{problem_name}.plan", encoding="utf-8") as file:
+        return tuple(_extract_plan(file))
+
 
 class TestSolve(AbstractTest):
     """
@@ -52,16 +91,72 @@ class TestSolve(AbstractTest):
     @classmethod
     def setUpClass(cls) -> None:
         super().setUpClass()
+        # Shared by the synchronisation problems, whose robot has no parent type.
+        cls.t_robot_sync = HtnType("robot")
+        cls.v_robot_sync = HtnVariable("?r", cls.t_robot_sync)
+        cls.o_robot_sync = HtnConstant("R", cls.t_robot_sync)
+        cls.tp1, cls.tp2, cls.tp3 = (
+            (HtnVariableTimepoint(f"?ts{i}"), HtnVariableTimepoint(f"?te{i}"))
+            for i in range(1, 4)
+        )
+        # Initial state of the move problem, from which its variants remove effects.
+        cls.move_init = {cls.i_robot_loc0, *cls.i_paths}
+        # Template of the move variants, which override its attributes with
+        # `copy_with` instead of modifying it.
+        cls.move_problem = HtnProblem(
+            HtnDomain(
+                HtnLanguage(
+                    {cls.v_robot, cls.v_from, cls.v_to, cls.v_location},
+                    {cls.o_loc0, cls.o_loc1, cls.o_loc2, cls.o_robot},
+                    {cls.s_sv_at, cls.s_sv_path},
+                    {cls.s_p_move},
+                    {cls.s_c_go},
+                    {cls.l_0},
+                ),
+                {cls.p_move},
+                {cls.c_go, cls.c_go_to},
+                {cls.m_go, cls.m_already_there},
+            ),
+            set(cls.move_init),
+            HtnTaskNetwork(
+                (
+                    HtnLabelMappingPair(
+                        cls.l_0,
+                        HtnCompoundTask(cls.s_c_go, (cls.o_robot, cls.o_loc1)),
+                    ),
+                )
+            ),
+            name="move",
+        )
+        cls.cleanup = None
         if os.path.exists("output"):
-            shutil.rmtree("output")
+            # Move the previous plans aside and delete them in the background,
+            # the tests can write the new ones meanwhile.
+            # A deletion still running at the end of the run is resumed by the next
+            # one, the stale directories are ignored by git.
+            stale = f"output.stale.{os.getpid()}.{time.time_ns()}"
+            try:
+                os.rename("output", stale)
+            except OSError:
+                shutil.rmtree("output")
+            else:
+                cls.cleanup = threading.Thread(
+                    target=_remove_stale_outputs, daemon=True
+                )
+                cls.cleanup.start()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        if cls.cleanup is not None:
+            # Give the deletion a chance to finish before the daemon thread is killed.
+            cls.cleanup.join(timeout=10)
+        super().tearDownClass()
 
     def test(self):
-        """Run all tests based on the getters."""
-        for problem_getter in [
-            v for v in dir(self) if callable(getattr(self, v)) and "get_" in v
-        ]:
-            logger.info("Testing %s", problem_getter)
-            self.run_problem(getattr(self, problem_getter)())
+        """Run all tests based on the registered getters."""
+        for name in _PROBLEM_GETTERS:
+            logger.info("Testing %s", name)
+            self.run_problem(getattr(self, name)())
 
     #################################################
     # Generic functions                             #
@@ -71,34 +166,21 @@ class TestSolve(AbstractTest):
         """
         Checks that the plan calculated by the solver is correct.
         """
-
-        def extract_plan(file):
-            lines = []
-            plan = False
-            for line in file:
-                if line == "**** Plan ****\n":
-                    plan = True
-                    continue
-                if not plan:
-                    continue
-                lines.append(line.strip())
-            lines = [line for line in lines if line != ""]
-            return lines
-
-        with open(f"output/{problem_name}.plan", encoding="utf-8") as file:
-            output_lines = extract_plan(file)
-        with open(
-            f"tests/expected_plans/{problem_name}.plan", encoding="utf-8"
-        ) as file:
-            expected_lines = extract_plan(file)
-        self.assertEqual(output_lines, expected_lines)
+        with open(f"output/{problem_name}.plan", encoding="utf-8") as output:
+            pairs = zip_longest(
+                _extract_plan(output), _load_expected_plan(problem_name)
+            )
+            for i, (output_line, expected_line) in enumerate(pairs):
+                self.assertEqual(output_line, expected_line, f"plan line {i}")
 
     def run_problem(self, problem: HtnProblem) -> None:
         """
         Generic test function for a given problem.
         """
         ch_problem = ChroniclesProblem.from_htn(problem)
-        if problem.name[-10:] == "impossible":
+        # The impossible problems are named after their expected failure.
+        self.assertEqual(problem.expected_failure, problem.name.endswith("impossible"))
+        if problem.expected_failure:
             with self.assertRaises(NoSolutionFoundError):
                 ch_problem.solve()
         else:
@@ -109,142 +191,121 @@ class TestSolve(AbstractTest):
     # Plan getters                                  #
     #################################################
 
+    @problem_getter
     def get_move_problem(self) -> HtnProblem:
         """
         Creates and returns a moving problem.
         """
-        return HtnProblem(
-            HtnDomain(
-                HtnLanguage(
-                    {self.v_robot, self.v_from, self.v_to, self.v_location},
-                    {self.o_loc0, self.o_loc1, self.o_loc2, self.o_robot},
-                    {self.s_sv_at, self.s_sv_path},
-                    {self.s_p_move},
-                    {self.s_c_go},
-                    {self.l_0},
-                ),
-                {self.p_move},
-                {self.c_go, self.c_go_to},
-                {self.m_go, self.m_already_there},
-            ),
-            {
-                self.i_robot_loc0,
-                self.i_path_loc0_loc1,
-                self.i_path_loc0_loc2,
-                self.i_path_loc1_loc0,
-                self.i_path_loc1_loc2,
-                self.i_path_loc2_loc0,
-                self.i_path_loc2_loc1,
-            },
-            HtnTaskNetwork(
+        return self.move_problem
+
+    @problem_getter
+    def get_no_move_problem(self) -> HtnProblem:
+        """
+        Creates and returns a no moving problem.
+        """
+        return self.move_problem.copy_with(  # type: ignore
+            tn_I=HtnTaskNetwork(
                 (
                     HtnLabelMappingPair(
                         self.l_0,
-                        HtnCompoundTask(self.s_c_go, (self.o_robot, self.o_loc1)),
+                        HtnCompoundTask(self.s_c_go, (self.o_robot, self.o_loc0)),
                     ),
                 )
             ),
-            name="move",
-        )
-
-    def get_no_move_problem(self) -> HtnProblem:
-        """
-        Creates and returns a no moving problem.
-        """
-        move_problem = self.get_move_problem()
-        move_problem.tn_I = HtnTaskNetwork(
-            (
-                HtnLabelMappingPair(
-                    self.l_0, HtnCompoundTask(self.s_c_go, (self.o_robot, self.o_loc0))
-                ),
-            )
+            name="no-move",
         )
-        move_problem.name = "no-move"
-        return move_problem
 
+    @problem_getter
     def get_move_temporal_problem(self) -> HtnProblem:
         """
         Creates and returns a moving problem with temporal constraints.
         """
-        problem = self.get_move_problem()
-        problem.D.Tp = {self.p_move_durative}
-        problem.name = "move-temporal"
-        return problem
+        return self.move_problem.copy_with(  # type: ignore
+            D=self.move_problem.D.copy_with(Tp={self.p_move_durative}),
+            name="move-temporal",
+        )
 
+    @problem_getter
     def get_move_problem_same_action(self) -> HtnProblem:
         """
         Creates and return a moving problem A --> B --> A --> B.
         """
-        problem = self.get_move_problem()
         move_to_loc0 = HtnCompoundTask(self.s_c_go, (self.o_robot, self.o_loc0))
         move_to_loc1 = HtnCompoundTask(self.s_c_go, (self.o_robot, self.o_loc1))
-        problem.tn_I = HtnTaskNetwork(
-            (
-                HtnLabelMappingPair(self.l_0, move_to_loc1),
-                HtnLabelMappingPair(self.l_1, move_to_loc0),
-                HtnLabelMappingPair(self.l_2, move_to_loc1),
-            ),
-            (
-                HtnTemporalConstraint(
-                    move_to_loc1.end, move_to_loc0.start, "<=", self.l_0, self.l_1
+        return self.move_problem.copy_with(  # type: ignore
+            tn_I=HtnTaskNetwork(
+                (
+                    HtnLabelMappingPair(self.l_0, move_to_loc1),
+                    HtnLabelMappingPair(self.l_1, move_to_loc0),
+                    HtnLabelMappingPair(self.l_2, move_to_loc1),
                 ),
-                HtnTemporalConstraint(
-                    move_to_loc0.end, move_to_loc1.start, "<=", self.l_1, self.l_2
+                (
+                    HtnTemporalConstraint(
+                        move_to_loc1.end, move_to_loc0.start, "<=", self.l_0, self.l_1
+                    ),
+                    HtnTemporalConstraint(
+                        move_to_loc0.end, move_to_loc1.start, "<=", self.l_1, self.l_2
+                    ),
                 ),
             ),
+            name="move-same",
         )
-        problem.name = "move-same"
-        return problem
 
+    @problem_getter
     def get_move_impossible_problem(self) -> HtnProblem:
         """
         Creates and returns an impossible moving problem.
         """
-        problem = self.get_move_problem()
-        problem.s_I.remove(self.i_path_loc0_loc1)
-        problem.name = "move-impossible"
-        return problem
+        return self.move_problem.copy_with(  # type: ignore
+            s_I=self.move_init - {self.i_path_loc0_loc1},
+            name="move-impossible",
+            expected_failure=True,
+        )
 
+    @problem_getter
     def get_move_after_problem(self) -> HtnProblem:
         """
         Creates and return a moving problem which has to be done after 15 units of time.
         """
-        problem = self.get_move_temporal_problem()
         move_to_loc1 = HtnCompoundTask(self.s_c_go, (self.o_robot, self.o_loc1))
-        problem.tn_I = HtnTaskNetwork(
-            (HtnLabelMappingPair(self.l_0, move_to_loc1),),
-            (
-                HtnTemporalConstraint(
-                    move_to_loc1.start, HTN_ZERO + 15, ">=", self.l_0, None
+        return self.get_move_temporal_problem().copy_with(  # type: ignore
+            tn_I=HtnTaskNetwork(
+                (HtnLabelMappingPair(self.l_0, move_to_loc1),),
+                (
+                    HtnTemporalConstraint(
+                        move_to_loc1.start, HTN_ZERO + 15, ">=", self.l_0, None
+                    ),
                 ),
             ),
+            name="move-after",
         )
-        problem.name = "move-after"
-        return problem
 
+    @problem_getter
     def get_move_before_problem(self) -> HtnProblem:
         """
         Creates and return a moving problem which has to be done before time 15.
         """
-        problem = self.get_move_temporal_problem()
         move_to_loc1 = HtnCompoundTask(self.s_c_go, (self.o_robot, self.o_loc1))
-        problem.tn_I = HtnTaskNetwork(
-            (HtnLabelMappingPair(self.l_0, move_to_loc1),),
-            (
-                HtnTemporalConstraint(
-                    move_to_loc1.end, HTN_ZERO + 15, "<=", self.l_0, None
+        return self.get_move_temporal_problem().copy_with(  # type: ignore
+            tn_I=HtnTaskNetwork(
+                (HtnLabelMappingPair(self.l_0, move_to_loc1),),
+                (
+                    HtnTemporalConstraint(
+                        move_to_loc1.end, HTN_ZERO + 15, "<=", self.l_0, None
+                    ),
                 ),
             ),
+            name="move-before",
         )
-        problem.name = "move-before"
-        return problem
 
+    @problem_getter
     def get_transfer_problem(self) -> HtnProblem:
         """
         Creates and returns a delivering problem.
         """
         return self.problem
 
+    @problem_getter
     def get_no_transfer_problem(self) -> HtnProblem:
         """
         Creates and returns a no delivering problem.
@@ -261,33 +322,41 @@ class TestSolve(AbstractTest):
         transfer_problem.name = "no-transfer"
         return transfer_problem
 
+    @problem_getter
     def get_transfer_temporal_problem(self) -> HtnProblem:
         """
         Creates and returns a delivering problem with temporal constraints.
         """
         return self.problem_durative
 
+    @problem_getter
     def get_overlap_problem(self) -> HtnProblem:
         """Create and return an overlapping problem with temporal constraints."""
         move = HtnCompoundTask(self.s_c_go, (self.o_robot, self.o_loc1))
         speak = HtnPrimitiveTask(self.s_p_speak, (self.o_robot,))
 
-        problem = self.get_move_temporal_problem()
-        problem.D.L.Prims.add(self.s_p_speak)
-        problem.D.Tp.add(self.p_speak)
-        problem.tn_I = HtnTaskNetwork(
-            (
-                HtnLabelMappingPair(self.l_0, move),
-                HtnLabelMappingPair(self.l_1, speak),
+        domain = self.get_move_temporal_problem().D
+        return self.move_problem.copy_with(  # type: ignore
+            D=domain.copy_and_extend_with(
+                L=domain.L.copy_and_extend_with(Prims={self.s_p_speak}),
+                Tp={self.p_speak},
             ),
-            (
-                HtnTemporalConstraint(move.start, speak.start, "<", self.l_0, self.l_1),
-                HtnTemporalConstraint(speak.end, move.end, "<", self.l_1, self.l_0),
+            tn_I=HtnTaskNetwork(
+                (
+                    HtnLabelMappingPair(self.l_0, move),
+                    HtnLabelMappingPair(self.l_1, speak),
+                ),
+                (
+                    HtnTemporalConstraint(
+                        move.start, speak.start, "<", self.l_0, self.l_1
+                    ),
+                    HtnTemporalConstraint(speak.end, move.end, "<", self.l_1, self.l_0),
+                ),
             ),
+            name="overlap",
         )
-        problem.name = "overlap"
-        return problem
 
+    @problem_getter
     def get_exterior_temporal_constraints(self):
         """
         Create a problem with a temporal constraint where one
@@ -296,13 +365,9 @@ class TestSolve(AbstractTest):
         # pylint: disable=too-many-locals
 
         # Variables & Constants
-        t_robot = HtnType("robot")
-        v_robot = HtnVariable("?r", t_robot)
-        o_robot = HtnConstant("R", t_robot)
-
-        start1, end1 = (HtnVariableTimepoint(v) for v in ["?ts1", "?te1"])
-        start2, end2 = (HtnVariableTimepoint(v) for v in ["?ts2", "?te2"])
-        start3, end3 = (HtnVariableTimepoint(v) for v in ["?ts3", "?te3"])
+        v_robot, o_robot = self.v_robot_sync, self.o_robot_sync
+        (start1, end1), (start2, end2) = self.tp1, self.tp2
+        start3, end3 = self.tp3
 
         # State variables
         s_sv_flag_end_action2 = HtnStateVariableSymbol("flag-end-action2")
@@ -395,17 +460,14 @@ class TestSolve(AbstractTest):
             "exterior",
         )
 
+    @problem_getter
     def get_start_synchronisation_problem(self) -> HtnProblem:
         """Create a problem where two actions have to start at the same moment."""
         # pylint: disable=too-many-locals
 
         # Variables & Constants
-        t_robot = HtnType("robot")
-        v_robot = HtnVariable("?r", t_robot)
-        o_robot = HtnConstant("R", t_robot)
-
-        start1, end1 = (HtnVariableTimepoint(v) for v in ["?ts1", "?te1"])
-        start2, end2 = (HtnVariableTimepoint(v) for v in ["?ts2", "?te2"])
+        v_robot, o_robot = self.v_robot_sync, self.o_robot_sync
+        (start1, end1), (start2, end2) = self.tp1, self.tp2
 
         # State variables
         s_sv_flag_start_action1 = HtnStateVariableSymbol("flag-start-action1")
@@ -503,10 +565,12 @@ class TestSolve(AbstractTest):
             "start-sync",
         )
 
+    @problem_getter
     def get_impossible_start_synchronisation_problem(self) -> HtnProblem:
         """Create an impossible problem of synchronisation."""
         problem = self.get_start_synchronisation_problem()
         problem.name += "-impossible"
+        problem.expected_failure = True
         for method in problem.D.M:
             if method.symbol.name == "method3":
                 problem.D.M.remove(method)
@@ -526,17 +590,14 @@ class TestSolve(AbstractTest):
                 )
         return problem
 
+    @problem_getter
     def get_end_synchronisation_problem(self) -> HtnProblem:
         """Create a problem where two actions have to end at the same moment."""
         # pylint: disable=too-many-locals
 
         # Variables & Constants
-        t_robot = HtnType("robot")
-        v_robot = HtnVariable("?r", t_robot)
-        o_robot = HtnConstant("R", t_robot)
-
-        start1, end1 = (HtnVariableTimepoint(v) for v in ["?ts1", "?te1"])
-        start2, end2 = (HtnVariableTimepoint(v) for v in ["?ts2", "?te2"])
+        v_robot, o_robot = self.v_robot_sync, self.o_robot_sync
+        (start1, end1), (start2, end2) = self.tp1, self.tp2
 
         # State variables
         s_sv_flag_end_action1 = HtnStateVariableSymbol("flag-end-action1")
@@ -634,10 +695,12 @@ class TestSolve(AbstractTest):
             "end-sync",
         )
 
+    @problem_getter
     def get_impossible_end_synchronisation_problem(self) -> HtnProblem:
         """Create an impossible problem of synchronisation."""
         problem = self.get_end_synchronisation_problem()
         problem.name += "-impossible"
+        problem.expected_failure = True
         for method in problem.D.M:
             if method.symbol.name == "method3":
                 problem.D.M.remove(method)
@@ -657,14 +720,14 @@ class TestSolve(AbstractTest):
                 )
         return problem
 
+    @problem_getter
     def get_constraint_abstract_task_problem(self) -> HtnProblem:
         """Create a problem where the abstract task has temporal constraints."""
         # pylint: disable=too-many-locals
 
         # Variables & Constants
-        start_c1, end_c1 = (HtnVariableTimepoint(v) for v in ["?ts1", "?te1"])
-        start_p1, end_p1 = (HtnVariableTimepoint(v) for v in ["?ts2", "?te2"])
-        start_p2, end_p2 = (HtnVariableTimepoint(v) for v in ["?ts3", "?te3"])
+        (start_c1, end_c1), (start_p1, end_p1) = self.tp1, self.tp2
+        start_p2, end_p2 = self.tp3
 
         # Primitive tasks
         s_p_1 = HtnPrimitiveTaskSymbol("action1")
@@ -732,6 +795,7 @@ class TestSolve(AbstractTest):
             "abstract-constraint",
         )
 
+    @problem_getter
     def get_outside_effect_problem(self) -> HtnProblem:
         """Create a problem with an effect outside the action scope."""
         # Predicate
@@ -805,6 +869,7 @@ class TestSolve(AbstractTest):
             name="outside-effect",
         )
 
+    @problem_getter
     def get_instantaneous_action_without_effect_problem(self) -> HtnProblem:
         """Create a problem with an an instantaneous action without effect."""
         # Predicate
@@ -839,6 +904,7 @@ class TestSolve(AbstractTest):
             name="instant-action-without-effect",
         )
 
+    @problem_getter
     def get_instantaneous_action_with_effect_problem(self) -> HtnProblem:
         """Create a problem with an an instantaneous action without effect."""
         # Predicate